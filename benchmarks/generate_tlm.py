@@ -0,0 +1,121 @@
+import argparse
+import random
+import sys
+from xml.sax.saxutils import quoteattr
+
+# SOLIDWORKS tool type codes the converters know about (plus one they don't)
+MILL_TOOL_TYPES = ['2', '2', '2', '0', '18', '12', '10', '15', '20', '99']
+LATHE_TOOL_TYPES = ['16', '16', '17', '18', '19', '20', '3']
+
+
+def _attrs(**attrs):
+    return ''.join(f' {name}={quoteattr(str(value))}' for name, value in attrs.items())
+
+
+def _mill_tool(rng, number):
+    diameter = rng.choice([1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 20, 25, 32, 50])
+    tool_type = rng.choice(MILL_TOOL_TYPES)
+    flute_length = round(diameter * rng.uniform(1.5, 4), 2)
+    shoulder_length = round(flute_length + rng.uniform(2, 10), 2)
+    overall_length = round(shoulder_length + rng.uniform(20, 60), 2)
+    feeds = _attrs(Normal=rng.randint(200, 3000), LeadIn=rng.randint(50, 300),
+                   LeadOut=rng.randint(50, 300), Z=rng.randint(50, 500))
+
+    return (
+        f'    <CompTool{_attrs(Type=0, ToolNumber=number, Name=f"Station {number}")}>\n'
+        f'      <CompTool{_attrs(Type=1, Name=f"{diameter}mm Tool {number}", ToolType=tool_type)}>\n'
+        f'        <Shape{_attrs(NumFlutes=rng.choice([1, 2, 3, 4, 6]))}>\n'
+        f'          <LenParams>\n'
+        f'            <D Val="{diameter}"/>\n'
+        f'            <R Val="{round(rng.choice([0, 0, 0.2, 0.5, diameter / 2]), 2)}"/>\n'
+        f'            <CL Val="{flute_length}"/>\n'
+        f'            <SL Val="{shoulder_length}"/>\n'
+        f'            <TL Val="{overall_length}"/>\n'
+        f'            <TipL Val="{round(diameter * 0.3, 2)}"/>\n'
+        f'          </LenParams>\n'
+        f'        </Shape>\n'
+        f'        <CuttingConditionsList>\n'
+        f'          <CC Material="Aluminum">\n'
+        f'            <MillingFeedSpin>\n'
+        f'              <Feeds{feeds}/>\n'
+        f'              <Spins{_attrs(Rate=rng.randint(1000, 12000))}/>\n'
+        f'            </MillingFeedSpin>\n'
+        f'          </CC>\n'
+        f'        </CuttingConditionsList>\n'
+        f'      </CompTool>\n'
+        f'    </CompTool>\n'
+    )
+
+
+def _lathe_tool(rng, number):
+    shank = rng.choice([12, 16, 20, 25, 32])
+    tool_type = rng.choice(LATHE_TOOL_TYPES)
+    holder = _attrs(ShankHeight=shank, ShankWidth=shank,
+                    ToolLength=rng.choice([100, 125, 150, 170]),
+                    ApproachAngleGUI=rng.choice([93, 95, 107.5]))
+    insert = _attrs(InsertCornerRadius=rng.choice([0.2, 0.4, 0.8, 1.2]),
+                    InsertCuttingEdgeLength=rng.choice([9.525, 12.7, 16]),
+                    InsertThickness=rng.choice([3.18, 4.76]),
+                    InsertNoseAngle=rng.choice([35, 55, 80]))
+
+    return (
+        f'    <CompTool{_attrs(Type=0, ToolNumber=number, Name=f"Station {number}")}>\n'
+        f'      <CompTool{_attrs(Type=5, Name=f"Holder T{number}")}>\n'
+        f'        <Shape{holder}/>\n'
+        f'        <CompTool{_attrs(Type=1, Name=f"Insert {number}", ToolType=tool_type)}>\n'
+        f'          <Shape{insert}/>\n'
+        f'          <CuttingConditionsList>\n'
+        f'            <CC Material="Steel">\n'
+        f'              <TurningFeedSpin>\n'
+        f'                <Feeds{_attrs(Normal=round(rng.uniform(0.05, 0.4), 3))}/>\n'
+        f'                <Spins{_attrs(Normal=rng.randint(300, 3000))}/>\n'
+        f'              </TurningFeedSpin>\n'
+        f'            </CC>\n'
+        f'          </CuttingConditionsList>\n'
+        f'        </CompTool>\n'
+        f'      </CompTool>\n'
+        f'    </CompTool>\n'
+    )
+
+
+def generate_tlm(path, mill=0, lathe=0, seed=0):
+    """Write a synthetic SOLIDWORKS .tlm with `mill` milling and `lathe` turning tools
+
+    The layout follows what the converters read: a CompTool Type="0" per
+    station holding either a Type="1" tool definition (mill) or a Type="5"
+    holder with a Type="1" insert (lathe), each with Shape/LenParams or
+    insert attributes and CuttingConditionsList/CC feeds and spins.
+    The same arguments always produce the same file.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='ISO-8859-1') as f:
+        f.write('<?xml version="1.0" encoding="ISO-8859-1"?>\n')
+        f.write(f'<ToolLibrary{_attrs(Name=f"Synthetic {mill} mill {lathe} lathe")}>\n')
+        f.write('  <Tools>\n')
+        number = 1
+        for _ in range(mill):
+            f.write(_mill_tool(rng, number))
+            number += 1
+        for _ in range(lathe):
+            f.write(_lathe_tool(rng, number))
+            number += 1
+        f.write('  </Tools>\n')
+        f.write('</ToolLibrary>\n')
+    return mill + lathe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic SOLIDWORKS .tlm')
+    parser.add_argument('output')
+    parser.add_argument('--mill', type=int, default=0, help='number of milling tools')
+    parser.add_argument('--lathe', type=int, default=0, help='number of turning tools')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    tools = generate_tlm(args.output, args.mill, args.lathe, args.seed)
+    print(f"Wrote {tools} tools to: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""Time the converters and the prettifier on synthetic libraries
+
+Every measurement runs in a fresh interpreter so peak RSS belongs to that
+one run. Results are written as JSON; pass an earlier results file with
+--compare to see the change per target and size.
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from generate_tlm import generate_tlm  # noqa: E402
+from tlm_converter.profiling import peak_rss_kb  # noqa: E402
+
+# target -> (kind of library it reads, description)
+TARGETS = {
+    'mill': ('mill', 'convert_to_exact_inventor_format, ET.parse'),
+    'mill-stream': ('mill', 'convert_to_exact_inventor_format, iterparse'),
+    'lathe': ('lathe', 'convert_lathe_tlm_to_inventor_format, ET.parse'),
+    'lathe-stream': ('lathe', 'convert_lathe_tlm_to_inventor_format, iterparse'),
+    'mill-inch': ('mill', 'convert_to_exact_inventor_format, iterparse, unit=inch'),
+    'mill-json': ('mill', 'convert_to_exact_inventor_format, iterparse, fmt=json'),
+    'mill-parquet': ('mill', 'convert_to_exact_inventor_format, iterparse, fmt=parquet'),
+    'unified': ('mixed', 'convert_mixed_library, iterparse'),
+    'prettify': ('mill', 'prettify_tlm, streaming'),
+    'prettify-minidom': ('mill', 'prettify_tlm_minidom'),
+}
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# minidom needs well over 1 GB at 100k tools; only run it below this
+MINIDOM_MAX_TOOLS = 10000
+
+
+def run_target(target, tlm_file, out_dir):
+    """Run one target once in this process"""
+    output = os.path.join(out_dir, target + '.out')
+    with contextlib.redirect_stdout(io.StringIO()):
+        if target in ('mill', 'mill-stream', 'lathe', 'lathe-stream'):
+            from tlm_converter.batch import load_converter
+            convert = load_converter(target.split('-')[0])
+            convert(tlm_file, output, stream=target.endswith('-stream'))
+        elif target == 'mill-inch':
+            from tlm_converter.mill import convert_to_exact_inventor_format
+            convert_to_exact_inventor_format(tlm_file, output, stream=True, unit='inch')
+        elif target in ('mill-json', 'mill-parquet'):
+            from tlm_converter.mill import convert_to_exact_inventor_format
+            convert_to_exact_inventor_format(tlm_file, output, stream=True,
+                                             fmt=target.split('-')[1])
+        elif target == 'unified':
+            from tlm_converter.unified import convert_mixed_library
+            convert_mixed_library(tlm_file, output + '.mill', output + '.lathe')
+        elif target == 'prettify':
+            from tlm_converter.prettify import prettify_tlm
+            prettify_tlm(tlm_file, output)
+        elif target == 'prettify-minidom':
+            from tlm_converter.prettify import prettify_tlm_minidom
+            prettify_tlm_minidom(tlm_file, output)
+
+
+def child_main(target, tlm_file, out_dir):
+    start = time.perf_counter()
+    run_target(target, tlm_file, out_dir)
+    seconds = time.perf_counter() - start
+    json.dump({'seconds': seconds, 'peak_rss_kb': peak_rss_kb()}, sys.stdout)
+    return 0
+
+
+def measure(target, tlm_file, out_dir, repeat):
+    """Best wall time and the peak RSS of that run, each in a fresh interpreter"""
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', target, tlm_file, out_dir],
+            capture_output=True, text=True, check=True)
+        run = json.loads(proc.stdout)
+        if best is None or run['seconds'] < best['seconds']:
+            best = run
+    return best
+
+
+def library_for(kind, tools, work_dir):
+    """Path of a synthetic library with `tools` tools, generating it once"""
+    path = os.path.join(work_dir, f'{kind}_{tools}.tlm')
+    if not os.path.exists(path):
+        mill = {'mill': tools, 'lathe': 0, 'mixed': tools - tools // 2}[kind]
+        generate_tlm(path, mill=mill, lathe=tools - mill)
+    return path
+
+
+def run_benchmarks(sizes, targets, repeat=1, work_dir=None):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = work_dir or tmp
+        os.makedirs(work_dir, exist_ok=True)
+        for tools in sizes:
+            for target in targets:
+                if target == 'prettify-minidom' and tools > MINIDOM_MAX_TOOLS:
+                    continue
+                tlm_file = library_for(TARGETS[target][0], tools, work_dir)
+                run = measure(target, tlm_file, tmp, repeat)
+                result = {
+                    'target': target,
+                    'description': TARGETS[target][1],
+                    'tools': tools,
+                    'seconds': round(run['seconds'], 4),
+                    'tools_per_sec': round(tools / run['seconds'], 1),
+                    'peak_rss_kb': run['peak_rss_kb'],
+                }
+                results.append(result)
+                print(f"{target:<18} {tools:>7} tools  {result['seconds']:>8.3f} s  "
+                      f"{result['tools_per_sec']:>10.0f} tools/s  "
+                      f"{_format_kb(result['peak_rss_kb']):>10}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline):
+    """Print each result next to the same target and size from a baseline run"""
+    previous = {(r['target'], r['tools']): r for r in baseline['results']}
+    print(f"{'target':<18} {'tools':>7} {'time':>8} {'RSS':>8}", file=sys.stderr)
+    for r in results:
+        old = previous.get((r['target'], r['tools']))
+        if old is None:
+            continue
+        time_ratio = r['seconds'] / old['seconds'] if old['seconds'] else float('nan')
+        if r['peak_rss_kb'] and old['peak_rss_kb']:
+            rss = f"{r['peak_rss_kb'] / old['peak_rss_kb']:.2f}x"
+        else:
+            rss = 'n/a'
+        print(f"{r['target']:<18} {r['tools']:>7} {time_ratio:>7.2f}x {rss:>8}", file=sys.stderr)
+
+
+def _format_kb(kb):
+    return 'n/a' if kb is None else f'{kb / 1024:.1f} MB'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='library sizes in tools (default: 1000 10000 100000)')
+    parser.add_argument('--targets', nargs='+', choices=sorted(TARGETS), default=list(TARGETS))
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per measurement; the fastest is kept')
+    parser.add_argument('--work-dir',
+                        help='keep the generated libraries here between runs')
+    parser.add_argument('--output', help='write results as JSON (default: stdout)')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    args = parser.parse_args(argv)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': run_benchmarks(args.sizes, args.targets, args.repeat, args.work_dir),
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report['results'], json.load(f))
+    return 0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        sys.exit(child_main(*sys.argv[2:]))
+    sys.exit(main())
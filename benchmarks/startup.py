@@ -0,0 +1,79 @@
+"""Measure how long `tlm-convert --help` takes and what it imports
+
+Runs `python -m tlm_converter --help` in fresh interpreters and reports the
+best wall time next to a bare `python -c pass`, then lists the heavy
+modules (ElementTree, minidom, multiprocessing, sqlite3, asyncio) that got imported, which
+should be none.
+
+    python benchmarks/startup.py --repeat 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules the CLI should only import once a subcommand actually runs
+# (csv and json are fine: --help reads the output formats from writers.py)
+HEAVY_MODULES = [
+    'xml.etree.ElementTree',
+    'xml.dom.minidom',
+    'xml.parsers.expat',
+    'concurrent.futures.process',
+    'multiprocessing',
+    'hashlib',
+    'sqlite3',
+    'asyncio',
+    'ctypes',
+]
+
+
+def best_time(command, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=REPO, stdout=subprocess.DEVNULL, check=True)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def imported_modules(args):
+    """Top-level import times (us) for `python -X importtime -m tlm_converter args`"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'tlm_converter'] + args,
+                          cwd=REPO, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='runs per measurement; the fastest is kept')
+    args = parser.parse_args(argv)
+
+    bare = best_time([sys.executable, '-c', 'pass'], args.repeat)
+    cli = best_time([sys.executable, '-m', 'tlm_converter', '--help'], args.repeat)
+    print(f"{'python -c pass':<32}{bare * 1000:7.1f} ms")
+    print(f"{'python -m tlm_converter --help':<32}{cli * 1000:7.1f} ms "
+          f"(+{(cli - bare) * 1000:.1f} ms)")
+
+    modules = imported_modules(['--help'])
+    heavy = [name for name in HEAVY_MODULES if name in modules]
+    if heavy:
+        print(f"❌ --help imported: {', '.join(heavy)}")
+        return 1
+    print(f"--help imported {len(modules)} modules, none of: {', '.join(HEAVY_MODULES)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from tlm_converter.batch import convert_library
+
+LIBRARY = '''<?xml version="1.0" encoding="ISO-8859-1"?>
+<ToolLibrary Name="a">
+ <Tools>
+  <CompTool Type="0" ToolNumber="1" Name="Station 1">
+   <CompTool Type="1" Name="Flat 6" ToolType="2">
+    <Shape NumFlutes="4"><LenParams><D Val="6"/><R Val="0"/><CL Val="20"/><SL Val="30"/><TL Val="60"/></LenParams></Shape>
+    <CuttingConditionsList><CC><MillingFeedSpin><Feeds Normal="800" LeadIn="100" LeadOut="100" Z="300"/><Spins Rate="{rate}"/></MillingFeedSpin></CC></CuttingConditionsList>
+   </CompTool>
+  </CompTool>
+ </Tools>
+</ToolLibrary>
+'''
+
+
+class CacheFetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tlm = os.path.join(self.tmp.name, 'a.tlm')
+        self.tsv = os.path.join(self.tmp.name, 'a_mill.tsv')
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.mtime = 1_000_000_000
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_library(self, rate):
+        with open(self.tlm, 'w', encoding='latin-1') as f:
+            f.write(LIBRARY.format(rate=rate))
+        # A new mtime for every edit, so the cache has to hash the content again
+        self.mtime += 1
+        os.utime(self.tlm, (self.mtime, self.mtime))
+
+    def convert(self):
+        result = convert_library('mill', self.tlm, self.tsv, cache_dir=self.cache_dir)
+        self.assertIsNone(result['error'])
+        with open(self.tsv, encoding='utf-8') as f:
+            return result['cached'], f.read()
+
+    def test_reverted_library_restores_cached_output(self):
+        self.write_library('6866')
+        cached, original = self.convert()
+        self.assertFalse(cached)
+
+        self.write_library('6000')  # same size as 6866
+        cached, edited = self.convert()
+        self.assertFalse(cached)
+        self.assertIn('6000', edited)
+        self.assertEqual(len(edited), len(original))
+
+        self.write_library('6866')
+        cached, reverted = self.convert()
+        self.assertTrue(cached)
+        self.assertEqual(reverted, original)
+
+    def test_unchanged_output_is_left_alone(self):
+        self.write_library('6866')
+        self.convert()
+        os.utime(self.tsv, (1, 1))
+        cached, _ = self.convert()
+        self.assertTrue(cached)
+        self.assertEqual(os.stat(self.tsv).st_mtime, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
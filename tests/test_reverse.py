@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from tlm_converter.reverse import tsv_to_tlm
+from tlm_converter.unified import convert_mixed_library
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'benchmarks'))
+
+from generate_tlm import generate_tlm  # noqa: E402
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, *parts):
+        path = os.path.join(self.tmp.name, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_mm_round_trip_gives_identical_tsvs(self):
+        # Same file name both times: the GUIDs are derived from it
+        source = self.path('first', 'Shop.tlm')
+        generate_tlm(source, mill=60, lathe=30)
+        mill_tsv, lathe_tsv = self.path('first', 'mill.tsv'), self.path('first', 'lathe.tsv')
+        counts = convert_mixed_library(source, mill_tsv, lathe_tsv)
+        self.assertEqual((counts['mill'], counts['lathe']), (60, 30))
+
+        rebuilt = self.path('again', 'Shop.tlm')
+        self.assertEqual(tsv_to_tlm([mill_tsv, lathe_tsv], rebuilt), {'mill': 60, 'lathe': 30})
+        mill_again, lathe_again = self.path('again', 'mill.tsv'), self.path('again', 'lathe.tsv')
+        convert_mixed_library(rebuilt, mill_again, lathe_again)
+
+        self.assertEqual(self.read(mill_again), self.read(mill_tsv))
+        self.assertEqual(self.read(lathe_again), self.read(lathe_tsv))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Convert SOLIDWORKS CAM .tlm tool libraries to Inventor CAM .tsv
+
+Everything is importable straight from the package; the module behind each
+name is only loaded the first time it's used, so importing the package (or
+running the CLI) stays cheap.
+"""
+
+__version__ = '0.1.0'
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    'convert_to_exact_inventor_format': 'mill',
+    'convert_lathe_tlm_to_inventor_format': 'lathe',
+    'convert_mixed_library': 'unified',
+    'prettify_tlm': 'prettify',
+    'write_pretty_tlm': 'prettify',
+    'batch_convert': 'batch',
+    'find_libraries': 'batch',
+    'ConversionCache': 'cache',
+    'LibraryIndex': 'index',
+    'LibraryWatcher': 'watch',
+    'Profiler': 'profiling',
+    'ToolTable': 'table',
+    'open_writer': 'writers',
+    'diff_inventor_tsv': 'diff',
+    'tsv_to_tlm': 'reverse',
+    'validate_tlm': 'validate',
+    'ValidationReport': 'validate',
+    'extract_mill_tool': 'tools',
+    'extract_lathe_tool': 'tools',
+    'iter_comp_tools': 'tools',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module('.' + module_name, __name__), name)
+    globals()[name] = value  # don't come back here next time
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,179 @@
+import glob
+import importlib
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .cache import ConversionCache
+from .diff import diff_inventor_tsv
+from .tools import is_library
+from .writers import WRITERS
+
+# kind -> (module, convert function)
+CONVERTERS = {
+    'mill': ('.mill', 'convert_to_exact_inventor_format'),
+    'lathe': ('.lathe', 'convert_lathe_tlm_to_inventor_format'),
+}
+
+
+def load_converter(kind):
+    """Return the convert function for 'mill' or 'lathe'"""
+    module_name, func_name = CONVERTERS[kind]
+    return getattr(importlib.import_module(module_name, __package__), func_name)
+
+
+def find_libraries(sources, recursive=False):
+    """Expand directories, globs and plain paths into a list of .tlm files"""
+    found = []
+    for source in sources:
+        if os.path.isdir(source):
+            if recursive:
+                candidates = [os.path.join(dirpath, name)
+                              for dirpath, _, names in os.walk(source)
+                              for name in names]
+            else:
+                candidates = [os.path.join(source, name) for name in os.listdir(source)]
+            matches = [path for path in candidates if is_library(path)]
+        else:
+            matches = [path for path in glob.glob(source, recursive=recursive)
+                       if os.path.isfile(path)]
+        for path in sorted(matches):
+            if path not in found:
+                found.append(path)
+    return found
+
+
+def output_path(tlm_file, kind, output_dir=None, fmt='tsv'):
+    """Where the output for one library goes, e.g. <output_dir>/<name>_<kind>.tsv"""
+    stem = os.path.splitext(os.path.basename(tlm_file))[0]
+    extension = WRITERS[fmt].extension
+    return os.path.join(output_dir or os.path.dirname(tlm_file), f'{stem}_{kind}{extension}')
+
+
+def changes_path(output_tsv):
+    """Where --diff puts the added/changed tools for one library"""
+    return os.path.splitext(output_tsv)[0] + '_changes.tsv'
+
+
+def convert_library(kind, tlm_file, output_tsv, stream=True, cache_dir=None, diff=False,
+                    unit='mm', fmt='tsv'):
+    """Convert one library and report how it went instead of raising
+
+    Runs inside the worker processes, so everything in the result has to be
+    picklable - errors are passed back as text. With a cache_dir, a library
+    whose content hasn't changed is served from the cache without parsing.
+    With diff=True, the tools that changed since the existing output_tsv are
+    also written to <output>_changes.tsv (and <output>_changes_removed.tsv);
+    that only works for fmt='tsv'.
+    """
+    result = {'source': tlm_file, 'output': output_tsv, 'tools': 0,
+              'cached': False, 'changes': None, 'error': None}
+    # The new output is written next to output_tsv and renamed into place, so
+    # Inventor never reads half a file and a failed run keeps the last good one
+    tmp_tsv = output_tsv + '.tmp'
+    previous_tsv = None
+    start = time.perf_counter()
+    try:
+        if diff and os.path.exists(output_tsv):
+            previous_tsv = output_tsv + '.prev'
+            shutil.copyfile(output_tsv, previous_tsv)
+
+        cache = key = None
+        if cache_dir:
+            cache = ConversionCache(cache_dir)
+            key = cache.key(kind, tlm_file, unit, fmt)
+            result['cached'] = cache.fetch(key, output_tsv)
+
+        if not result['cached']:
+            convert = load_converter(kind)
+            result['tools'] = convert(tlm_file, tmp_tsv, stream=stream, unit=unit, fmt=fmt)
+            if cache is not None:
+                cache.store(key, tmp_tsv)
+            os.replace(tmp_tsv, output_tsv)
+
+        if previous_tsv is not None:
+            result['changes'] = diff_inventor_tsv(previous_tsv, output_tsv,
+                                                  changes_path(output_tsv))
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        for path in (tmp_tsv, previous_tsv):
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def validate_library(tlm_file, kind=None, stream=True, max_issues=20, fail_fast=True):
+    """Validate one library (in a worker process); the report as a dict"""
+    from .validate import validate_tlm
+    return validate_tlm(tlm_file, kind, stream, max_issues, fail_fast).as_dict()
+
+
+def screen_libraries(libraries, kind=None, workers=None, stream=True, max_issues=20,
+                     fail_fast=True, pool=None):
+    """Validate every library in a process pool, without converting anything
+
+    With fail_fast (the default) each library is only read up to its first
+    error, so a big batch is screened in about the time of one parse.
+    Returns one validate.ValidationReport.as_dict() per library, in order.
+    """
+    count = len(libraries)
+    args = ([kind] * count, [stream] * count, [max_issues] * count, [fail_fast] * count)
+    if pool is not None:
+        return list(pool.map(validate_library, libraries, *args))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(validate_library, libraries, *args))
+
+
+def batch_convert(libraries, kind, output_dir=None, workers=None, stream=True,
+                  cache_dir=None, diff=False, unit='mm', fmt='tsv', validate=False):
+    """Convert every library in a process pool
+
+    Returns one result dict per library, in the same order. A library that
+    fails to convert gets its 'error' set; the rest of the batch carries on.
+    With validate=True every library is screened first (see
+    screen_libraries) and those with errors are not converted; their
+    result has the report under 'validation'.
+    """
+    if diff and fmt != 'tsv':
+        raise ValueError("diff=True needs fmt='tsv'")
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rejected = {}
+        if validate:
+            for report in screen_libraries(libraries, kind, stream=stream, pool=pool):
+                if report['errors']:
+                    rejected[report['source']] = report
+
+        futures = {
+            tlm_file: pool.submit(convert_library, kind, tlm_file,
+                                  output_path(tlm_file, kind, output_dir, fmt), stream,
+                                  cache_dir, diff, unit, fmt)
+            for tlm_file in libraries if tlm_file not in rejected
+        }
+
+        results = []
+        for tlm_file in libraries:
+            failed = {'source': tlm_file,
+                      'output': output_path(tlm_file, kind, output_dir, fmt),
+                      'tools': 0, 'cached': False, 'changes': None, 'seconds': 0.0}
+            report = rejected.get(tlm_file)
+            if report is not None:
+                first = report['first_error']
+                failed['error'] = (f"validation failed, not converted: "
+                                   f"{first['location']}: {first['message']}")
+                failed['validation'] = report
+                results.append(failed)
+                continue
+            try:
+                results.append(futures[tlm_file].result())
+            except Exception as e:
+                # The worker itself died (e.g. out of memory)
+                failed['error'] = f'{type(e).__name__}: {e}'
+                results.append(failed)
+    return results
+
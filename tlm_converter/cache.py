@@ -0,0 +1,152 @@
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from .schema import LATHE_TYPE_MAP, MILL_TYPE_MAP
+from .tools import CONVERTER_VERSION, file_sha256, library_name
+
+# Anything that changes the rows written for a given kind goes into its key
+TYPE_MAPS = {
+    'mill': MILL_TYPE_MAP,
+    'lathe': LATHE_TYPE_MAP,
+}
+
+
+class ConversionCache:
+    """On-disk cache of converted TSVs, keyed by the .tlm content
+
+    Layout under cache_dir:
+        objects/<key>.tsv   a converted library (a TSV unless the key is for another
+                            format); its mtime is the last time it was used
+        sources/<id>.json   size, mtime and content hash last seen for one .tlm path
+
+    The per-source records mean an untouched library costs one stat, and a
+    touched-but-identical one costs one hash, before it is skipped.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None, max_age=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes  # total size of objects/ to keep
+        self.max_age = max_age      # seconds since an entry was last used
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.sources_dir = os.path.join(cache_dir, 'sources')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.sources_dir, exist_ok=True)
+
+    def content_hash(self, tlm_file):
+        """sha256 of the file, reusing the last hash if size and mtime match"""
+        st = os.stat(tlm_file)
+        path_id = hashlib.sha1(os.path.abspath(tlm_file).encode('utf-8')).hexdigest()
+        record_path = os.path.join(self.sources_dir, path_id + '.json')
+
+        try:
+            with open(record_path, encoding='utf-8') as f:
+                record = json.load(f)
+            if record['size'] == st.st_size and record['mtime_ns'] == st.st_mtime_ns:
+                os.utime(record_path)
+                return record['sha256']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        record = {'path': os.path.abspath(tlm_file), 'size': st.st_size,
+                  'mtime_ns': st.st_mtime_ns, 'sha256': file_sha256(tlm_file)}
+        self._write_atomic(record_path, json.dumps(record).encode('utf-8'))
+        return record['sha256']
+
+    def key(self, kind, tlm_file, unit='mm', fmt='tsv'):
+        """Cache key for converting tlm_file with the given converter"""
+        identity = {
+            'sha256': self.content_hash(tlm_file),
+            'kind': kind,
+            'unit': unit,
+            'format': fmt,
+            'library': library_name(tlm_file),  # GUIDs are derived from it
+            'version': CONVERTER_VERSION,
+            'type_map': TYPE_MAPS[kind],
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def fetch(self, key, output_tsv):
+        """Put the cached TSV for key at output_tsv; False on a cache miss
+
+        If output_tsv already holds it, the file is left alone so Inventor
+        doesn't see a modified library.
+        """
+        cached = os.path.join(self.objects_dir, key + '.tsv')
+        try:
+            size = os.path.getsize(cached)
+        except OSError:
+            return False
+
+        os.utime(cached)  # mark as recently used
+        # Same size isn't same content (a feed edited and reverted, say), so
+        # compare the bytes before trusting the existing output
+        if not (os.path.exists(output_tsv) and os.path.getsize(output_tsv) == size
+                and filecmp.cmp(cached, output_tsv, shallow=False)):
+            # Copy next to the output and rename, so it's never half-written
+            tmp_path = output_tsv + '.tmp'
+            try:
+                shutil.copyfile(cached, tmp_path)
+                os.replace(tmp_path, output_tsv)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return True
+
+    def store(self, key, output_tsv):
+        """Keep a copy of a freshly converted TSV under key"""
+        with open(output_tsv, 'rb') as f:
+            self._write_atomic(os.path.join(self.objects_dir, key + '.tsv'), f.read())
+
+    def evict(self):
+        """Drop entries unused for max_age, then the least recently used over max_bytes
+
+        Returns the number of cached TSVs removed.
+        """
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.objects_dir):
+            if entry.name.endswith('.tsv') and entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()  # least recently used first
+
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            too_old = self.max_age is not None and now - mtime > self.max_age
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (too_old or too_big):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        # Forget sources we haven't seen for a while too
+        if self.max_age is not None:
+            for entry in os.scandir(self.sources_dir):
+                try:
+                    if now - entry.stat().st_mtime > self.max_age:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+        return removed
+
+    def _write_atomic(self, path, data):
+        # Several batch workers share the cache; never expose a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,558 @@
+import argparse
+import os
+import sys
+import time
+
+# Only argparse is imported up front: each subcommand imports what it needs
+# when it runs, so `--help` never pays for ElementTree, minidom or
+# multiprocessing.
+
+
+def _default_output(tlm_file, kind, fmt='tsv'):
+    from .writers import WRITERS
+    return f'{os.path.splitext(tlm_file)[0]}_{kind}{WRITERS[fmt].extension}'
+
+
+def _start_profiler(args):
+    """A running profiling.Profiler if --profile or --cprofile was given, else None"""
+    if not (args.profile or args.cprofile):
+        return None
+    from .profiling import Profiler
+    return Profiler(args.cprofile, args.trace_memory).start()
+
+
+def _save_profile(profiler, args, file=None, **info):
+    if profiler is None:
+        return
+    profiler.stop()
+    if args.profile:
+        profiler.write_report(args.profile, command=args.command, source=args.tlm_file,
+                              **info)
+        print(f"Profile saved to: {args.profile}", file=file)
+    if args.cprofile:
+        print(f"cProfile stats saved to: {args.cprofile}", file=file)
+
+
+def _start_validation(args):
+    """A validate.ValidationReport if --validate or --strict was given, else None"""
+    if not (args.validate or args.strict):
+        return None
+    from .validate import ValidationReport
+    return ValidationReport(args.tlm_file, args.max_issues, fail_fast=args.strict)
+
+
+def _print_validation(report, file=None):
+    """Print one library's validation result (a ValidationReport.as_dict())"""
+    mark = '❌ ' if report['errors'] else ''
+    print(f"{mark}{report['source']}: {report['summary']}", file=file)
+    for issue in report['issues']:
+        print(f"    {issue['level']:<8}{issue['location']}: {issue['message']}", file=file)
+    if report['dropped']:
+        print(f"    ... and {report['dropped']} more", file=file)
+
+
+def _converted(output, validation, convert):
+    """Run convert(); with --strict, remove output and report the first error"""
+    if validation is None or not validation.fail_fast:
+        return convert()
+    from .validate import ValidationFailed
+    try:
+        return convert()
+    except ValidationFailed as e:
+        if os.path.exists(output):
+            os.remove(output)
+        print(f"❌ Not converted, {e}")
+        return None
+
+
+def cmd_mill(args):
+    from .mill import convert_to_exact_inventor_format
+
+    output = args.output or _default_output(args.tlm_file, 'mill', args.format)
+    profiler = _start_profiler(args)
+    validation = _start_validation(args)
+    try:
+        tools = _converted(output, validation, lambda: convert_to_exact_inventor_format(
+            args.tlm_file, output, stream=not args.no_stream, library=args.library,
+            unit=args.unit, fmt=args.format, profiler=profiler, validation=validation))
+        if tools is None:
+            return 1
+        print(f"Converted {tools} mill tools")
+        print(f"Saved to: {output}")
+    finally:
+        # Runs --strict stopped (or that crashed) are the ones worth profiling
+        _save_profile(profiler, args, output=output)
+    return _finish_validation(validation)
+
+
+def cmd_lathe(args):
+    from .lathe import convert_lathe_tlm_to_inventor_format
+
+    output = args.output or _default_output(args.tlm_file, 'lathe', args.format)
+    profiler = _start_profiler(args)
+    validation = _start_validation(args)
+    try:
+        tools = _converted(output, validation, lambda: convert_lathe_tlm_to_inventor_format(
+            args.tlm_file, output, stream=not args.no_stream, library=args.library,
+            unit=args.unit, fmt=args.format, profiler=profiler, validation=validation))
+        if tools is None:
+            return 1
+        print(f"Converted {tools} lathe tools")
+        print(f"Saved to: {output}")
+    finally:
+        # Runs --strict stopped (or that crashed) are the ones worth profiling
+        _save_profile(profiler, args, output=output)
+    return _finish_validation(validation)
+
+
+def cmd_convert(args):
+    from .unified import convert_mixed_library
+
+    mill_tsv = args.mill or _default_output(args.tlm_file, 'mill', args.format)
+    lathe_tsv = args.lathe or _default_output(args.tlm_file, 'lathe', args.format)
+    profiler = _start_profiler(args)
+    validation = _start_validation(args)
+    try:
+        counts = _converted(mill_tsv, validation, lambda: convert_mixed_library(
+            args.tlm_file, mill_tsv, lathe_tsv, stream=not args.no_stream,
+            library=args.library, unit=args.unit, fmt=args.format, profiler=profiler,
+            validation=validation))
+        if counts is None:
+            if os.path.exists(lathe_tsv):
+                os.remove(lathe_tsv)
+            return 1
+        print(f"{counts['mill']} mill tools saved to: {mill_tsv}")
+        print(f"{counts['lathe']} lathe tools saved to: {lathe_tsv}")
+        if counts['skipped']:
+            print(f"Skipped {counts['skipped']} tools with no tool definition")
+    finally:
+        _save_profile(profiler, args, output=[mill_tsv, lathe_tsv])
+    return _finish_validation(validation)
+
+
+def _finish_validation(validation):
+    """Print what --validate found; the exit code (1 if there were errors)"""
+    if validation is None:
+        return 0
+    _print_validation(validation.as_dict())
+    return 0 if validation.ok else 1
+
+
+def cmd_prettify(args):
+    profiler = _start_profiler(args)
+    if args.stdout:
+        import io
+        from xml.parsers.expat import ExpatError
+        from .prettify import TLM_ENCODING, write_pretty_tlm
+
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding=TLM_ENCODING,
+                               errors='xmlcharrefreplace')
+        try:
+            write_pretty_tlm(args.tlm_file, out, profiler=profiler)
+            out.flush()
+        except (OSError, ExpatError) as e:
+            print(f"❌ Error prettifying: {e}", file=sys.stderr)
+            return 1
+        finally:
+            out.detach()
+            # stdout is the XML; keep it clean
+            _save_profile(profiler, args, file=sys.stderr, output='-')
+        return 0
+
+    if args.minidom:
+        from .prettify import prettify_tlm_minidom as prettify
+    else:
+        from .prettify import prettify_tlm as prettify
+
+    output = None
+    try:
+        output = prettify(args.tlm_file, args.output, profiler=profiler,
+                          in_place=args.in_place)
+        if output is None:
+            return 1
+        print(f"Prettified: {args.tlm_file}")
+        print(f"Saved to: {output}")
+    finally:
+        _save_profile(profiler, args, output=output, minidom=args.minidom)
+    return 0
+
+
+def cmd_batch(args):
+    from .batch import batch_convert, find_libraries
+
+    if args.diff and args.format != 'tsv':
+        print("--diff only works with --format tsv")
+        return 2
+
+    libraries = find_libraries(args.sources, args.recursive)
+    if not libraries:
+        print("No .tlm files found")
+        return 1
+
+    start = time.perf_counter()
+    results = batch_convert(libraries, args.kind, args.output_dir,
+                            args.workers, stream=not args.no_stream,
+                            cache_dir=args.cache_dir, diff=args.diff, unit=args.unit,
+                            fmt=args.format, validate=args.validate)
+    elapsed = time.perf_counter() - start
+
+    if args.cache_dir:
+        from .cache import ConversionCache
+        ConversionCache(args.cache_dir,
+                        max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                        max_age=args.cache_max_age_days * 24 * 3600).evict()
+
+    failed = [r for r in results if r['error']]
+    for r in results:
+        if r.get('validation'):
+            _print_validation(r['validation'])
+            continue
+        if r['error']:
+            print(f"❌ {r['source']}: {r['error']}")
+            continue
+        if r['cached']:
+            print(f"{r['source']} -> {r['output']} (unchanged, from cache)")
+        else:
+            print(f"{r['source']} -> {r['output']} ({r['tools']} tools, {r['seconds']:.2f}s)")
+        if r['changes'] is not None:
+            c = r['changes']
+            print(f"    {c['added']} added, {c['changed']} changed, {c['removed']} removed")
+
+    cached = sum(1 for r in results if r['cached'])
+    print(f"Converted {len(results) - len(failed)}/{len(results)} libraries "
+          f"({cached} from cache) in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+def cmd_diff(args):
+    from .diff import diff_inventor_tsv
+
+    summary = diff_inventor_tsv(args.previous, args.current, args.output, args.removed)
+    print(f"{summary['added']} added, {summary['changed']} changed, "
+          f"{summary['removed']} removed, {summary['unchanged']} unchanged")
+    print(f"Saved to: {args.output}")
+    return 0
+
+
+def cmd_validate(args):
+    from .batch import find_libraries, screen_libraries, validate_library
+
+    libraries = find_libraries(args.sources, args.recursive)
+    if not libraries:
+        print("No .tlm files found")
+        return 1
+
+    start = time.perf_counter()
+    if len(libraries) == 1:
+        reports = [validate_library(libraries[0], args.kind, not args.no_stream,
+                                    args.max_issues, args.fail_fast)]
+    else:
+        reports = screen_libraries(libraries, args.kind, args.workers, not args.no_stream,
+                                   args.max_issues, args.fail_fast)
+    elapsed = time.perf_counter() - start
+
+    for report in reports:
+        if report['errors'] or (report['warnings'] and not args.errors_only):
+            _print_validation(report)
+    if args.json:
+        import json
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+        print(f"Report saved to: {args.json}")
+
+    bad = sum(1 for report in reports if report['errors'])
+    print(f"Validated {len(reports)} libraries in {elapsed:.2f}s: "
+          f"{bad} with errors, {len(reports) - bad} OK")
+    return 1 if bad else 0
+
+
+def cmd_reverse(args):
+    from .reverse import tsv_to_tlm
+
+    counts = tsv_to_tlm(args.sources, args.output, library=args.library)
+    print(f"Wrote {counts['mill']} mill and {counts['lathe']} lathe tools")
+    print(f"Saved to: {args.output}")
+    return 0
+
+
+def cmd_index(args):
+    from .batch import find_libraries
+    from .index import LibraryIndex
+
+    libraries = find_libraries(args.sources, args.recursive)
+    if not libraries:
+        print("No .tlm files found")
+        return 1
+
+    start = time.perf_counter()
+    with LibraryIndex(args.db) as index:
+        summary = index.refresh(libraries, stream=not args.no_stream, workers=args.workers)
+        stats = index.stats()
+    elapsed = time.perf_counter() - start
+    for path, error in summary['failed']:
+        print(f"❌ {path}: {error}")
+    print(f"Indexed {summary['indexed']} libraries ({summary['tools']} tools), "
+          f"{summary['unchanged']} unchanged, {summary['removed']} removed, "
+          f"{len(summary['failed'])} failed in {elapsed:.2f}s")
+    print(f"{args.db}: {stats['libraries']} libraries, {stats['tools']} tools")
+    return 1 if summary['failed'] else 0
+
+
+# Columns printed by `query`, in order
+QUERY_COLUMNS = ['library', 'number', 'kind', 'type', 'name', 'diameter', 'corner_radius',
+                 'flute_length', 'shoulder_length', 'overall_length', 'num_flutes',
+                 'spindle_rpm', 'cutting_feedrate']
+
+# --name options of `query`, the keys of index.RANGES (not imported for --help)
+QUERY_RANGES = ['D', 'R', 'CL', 'SL', 'TL', 'NumFlutes', 'Spins', 'Feeds', 'FeedZ']
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return f'{value:g}'
+    return str(value)
+
+
+def cmd_query(args):
+    from .index import LibraryIndex
+
+    if not os.path.exists(args.db):
+        print(f"No index at {args.db}, run `tlm-convert index` first")
+        return 1
+
+    ranges = {name: getattr(args, name) for name in QUERY_RANGES
+              if getattr(args, name) is not None}
+    with LibraryIndex(args.db) as index:
+        tools = index.query(kind=args.kind, tool_type=args.type, number=args.number,
+                            library=args.library, ranges=ranges, limit=args.limit)
+
+    # Tab-separated so it can be piped into other tools; the count goes to stderr
+    print('\t'.join(QUERY_COLUMNS))
+    for tool in tools:
+        print('\t'.join(_cell(tool[name]) for name in QUERY_COLUMNS))
+    print(f"{len(tools)} tools", file=sys.stderr)
+    return 0
+
+
+def cmd_watch(args):
+    from .watch import watch
+
+    watch(args.directories, kind=args.kind, output_dir=args.output_dir,
+          recursive=args.recursive, workers=args.workers, debounce=args.debounce,
+          poll=args.poll, interval=args.interval, prettify=args.prettify,
+          stream=not args.no_stream, unit=args.unit, fmt=args.format)
+    return 0
+
+
+def _parse_range(text):
+    from .index import parse_range
+    try:
+        return parse_range(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LOW:HIGH, e.g. 6:10 or 20:, not {text!r}")
+
+
+def _add_output_options(parser):
+    from .writers import WRITERS
+
+    parser.add_argument('--unit', choices=['mm', 'inch'], default='mm',
+                        help='unit of the exported lengths and feeds (default: mm)')
+    parser.add_argument('--format', choices=list(WRITERS), default='tsv',
+                        help='tsv for Inventor (default), json, or parquet for analytics')
+
+
+def _add_convert_options(parser):
+    _add_output_options(parser)
+    parser.add_argument('--no-stream', action='store_true',
+                        help='parse the whole file with ET.parse instead of iterparse')
+    parser.add_argument('--library',
+                        help='library name the tool GUIDs are derived from '
+                             '(default: the .tlm file name)')
+    parser.add_argument('--validate', action='store_true',
+                        help='check every tool while converting and list what is wrong '
+                             '(exit code 1 if there are errors)')
+    parser.add_argument('--strict', action='store_true',
+                        help='stop at the first invalid tool and write nothing')
+    parser.add_argument('--max-issues', type=int, default=20,
+                        help='issues to list with --validate (default: 20)')
+    _add_profile_options(parser)
+
+
+def _add_profile_options(parser):
+    parser.add_argument('--profile', metavar='REPORT.json',
+                        help='write per-stage times, tool counters, defaults used and '
+                             'peak memory to this JSON file')
+    parser.add_argument('--cprofile', metavar='FILE.prof',
+                        help='also run cProfile and dump its stats here (slower)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='report the peak Python heap with tracemalloc (slower)')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='tlm-convert',
+        description='Convert SOLIDWORKS CAM .tlm tool libraries to Inventor CAM .tsv')
+    parser.add_argument('--version', action='version', version=_version())
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+
+    p = commands.add_parser('mill', help='convert a milling tool library')
+    p.add_argument('tlm_file')
+    p.add_argument('-o', '--output', help='output file (default: <name>_mill.tsv)')
+    _add_convert_options(p)
+    p.set_defaults(func=cmd_mill)
+
+    p = commands.add_parser('lathe', help='convert a lathe tool library')
+    p.add_argument('tlm_file')
+    p.add_argument('-o', '--output', help='output file (default: <name>_lathe.tsv)')
+    _add_convert_options(p)
+    p.set_defaults(func=cmd_lathe)
+
+    p = commands.add_parser('convert',
+                            help='convert a mixed mill/lathe library in one pass')
+    p.add_argument('tlm_file')
+    p.add_argument('--mill', help='mill output (default: <name>_mill.tsv)')
+    p.add_argument('--lathe', help='lathe output (default: <name>_lathe.tsv)')
+    _add_convert_options(p)
+    p.set_defaults(func=cmd_convert)
+
+    p = commands.add_parser('prettify', help='make a .tlm file human-readable')
+    p.add_argument('tlm_file')
+    p.add_argument('-o', '--output', help='output file (default: <name>_pretty.xml)')
+    p.add_argument('--stdout', action='store_true',
+                   help='write the XML to stdout, e.g. to pipe into less or grep')
+    p.add_argument('--minidom', action='store_true',
+                   help='use the old in-memory minidom implementation')
+    p.add_argument('--in-place', action='store_true',
+                   help='allow -o to be the .tlm itself and replace it')
+    _add_profile_options(p)
+    p.set_defaults(func=cmd_prettify)
+
+    p = commands.add_parser('batch', help='convert many libraries in parallel')
+    p.add_argument('kind', choices=['mill', 'lathe'], help='converter to run')
+    p.add_argument('sources', nargs='+', help='.tlm files, directories or glob patterns')
+    p.add_argument('-o', '--output-dir',
+                   help='where to write the output files (default: next to each .tlm)')
+    p.add_argument('-j', '--workers', type=int, default=None,
+                   help='number of worker processes (default: one per CPU)')
+    p.add_argument('-r', '--recursive', action='store_true',
+                   help='search directories (and ** globs) recursively')
+    p.add_argument('--no-stream', action='store_true',
+                   help='parse each file fully with ET.parse instead of iterparse')
+    p.add_argument('--diff', action='store_true',
+                   help='also write <name>_<kind>_changes.tsv with only the tools '
+                        'that changed since the previous output')
+    p.add_argument('--validate', action='store_true',
+                   help='screen every library first and skip the ones with errors')
+    _add_output_options(p)
+    p.add_argument('--cache-dir',
+                   help='skip libraries whose content is unchanged since the last run')
+    p.add_argument('--cache-max-mb', type=float, default=1024,
+                   help='evict least recently used cache entries above this size (default: 1024)')
+    p.add_argument('--cache-max-age-days', type=float, default=30,
+                   help='evict cache entries unused for this many days (default: 30)')
+    p.set_defaults(func=cmd_batch)
+
+    p = commands.add_parser('diff',
+                            help='write only the tools that changed between two exports')
+    p.add_argument('previous', help='the export Inventor already has')
+    p.add_argument('current', help='the new export')
+    p.add_argument('-o', '--output', required=True, help='TSV of added and changed tools')
+    p.add_argument('--removed', help='TSV of removed tools (default: <output>_removed.tsv)')
+    p.set_defaults(func=cmd_diff)
+
+    p = commands.add_parser('validate',
+                            help='check libraries for missing or invalid tool data')
+    p.add_argument('sources', nargs='+', help='.tlm files, directories or glob patterns')
+    p.add_argument('--kind', choices=['mill', 'lathe'],
+                   help='check against this converter (default: the mixed converter)')
+    p.add_argument('-r', '--recursive', action='store_true',
+                   help='search directories (and ** globs) recursively')
+    p.add_argument('-j', '--workers', type=int, default=None,
+                   help='number of worker processes (default: one per CPU)')
+    p.add_argument('--max-issues', type=int, default=20,
+                   help='issues to keep and list per library (default: 20)')
+    p.add_argument('--fail-fast', action='store_true',
+                   help='stop reading a library at its first error')
+    p.add_argument('--errors-only', action='store_true',
+                   help="don't list libraries that only have warnings")
+    p.add_argument('--json', metavar='REPORT.json', help='also save the reports as JSON')
+    p.add_argument('--no-stream', action='store_true',
+                   help='parse each file fully with ET.parse instead of iterparse')
+    p.set_defaults(func=cmd_validate)
+
+    p = commands.add_parser('reverse',
+                            help='build a .tlm library from Inventor TSV exports')
+    p.add_argument('sources', nargs='+', help='mill and/or lathe TSVs (version 14)')
+    p.add_argument('-o', '--output', required=True, help='.tlm file to write')
+    p.add_argument('--library', help='ToolLibrary name (default: the output file name)')
+    p.set_defaults(func=cmd_reverse)
+
+    p = commands.add_parser('index',
+                            help='build or refresh a searchable index of .tlm libraries')
+    p.add_argument('sources', nargs='+', help='.tlm files, directories or glob patterns')
+    p.add_argument('--db', default='tlm_index.db', help='index file (default: tlm_index.db)')
+    p.add_argument('-r', '--recursive', action='store_true',
+                   help='search directories (and ** globs) recursively')
+    p.add_argument('-j', '--workers', type=int, default=None,
+                   help='processes parsing changed libraries (default: one per CPU)')
+    p.add_argument('--no-stream', action='store_true',
+                   help='parse each file fully with ET.parse instead of iterparse')
+    p.set_defaults(func=cmd_index)
+
+    p = commands.add_parser('query',
+                            help='find tools in the index, e.g. --type "flat end mill" --D 6:10')
+    p.add_argument('--db', default='tlm_index.db', help='index file (default: tlm_index.db)')
+    p.add_argument('--kind', choices=['mill', 'lathe'])
+    p.add_argument('--type', help='Inventor tool type (e.g. "flat end mill") or ToolType code')
+    p.add_argument('--number', type=int, help='tool number')
+    p.add_argument('--library', help='library name (the .tlm file name)')
+    for name in QUERY_RANGES:
+        p.add_argument(f'--{name}', type=_parse_range, metavar='LOW:HIGH',
+                       help=f'{name} range (inclusive); either end may be left out')
+    p.add_argument('--limit', type=int, help='return at most this many tools')
+    p.set_defaults(func=cmd_query)
+
+    p = commands.add_parser('watch',
+                            help='reconvert libraries whenever they are saved')
+    p.add_argument('directories', nargs='+', help='directories holding .tlm files')
+    p.add_argument('--kind', choices=['mill', 'lathe', 'both'], default='both',
+                   help='which TSVs to write; both sorts each tool into mill or lathe '
+                        'in one parse (default)')
+    p.add_argument('-o', '--output-dir',
+                   help='where to write the output files (default: next to each .tlm)')
+    p.add_argument('-r', '--recursive', action='store_true',
+                   help='watch subdirectories too')
+    p.add_argument('-j', '--workers', type=int, default=None,
+                   help='number of worker processes (default: one per CPU)')
+    p.add_argument('--debounce', type=float, default=0.5,
+                   help='seconds a library has to stay unchanged before it is converted '
+                        '(default: 0.5)')
+    p.add_argument('--poll', action='store_true',
+                   help='poll instead of using inotify, e.g. for network shares')
+    p.add_argument('--interval', type=float, default=1.0,
+                   help='seconds between polls (default: 1)')
+    p.add_argument('--prettify', action='store_true',
+                   help='also write <name>_pretty.xml for each library')
+    p.add_argument('--no-stream', action='store_true',
+                   help='parse each file fully with ET.parse instead of iterparse')
+    _add_output_options(p)
+    p.set_defaults(func=cmd_watch)
+
+    return parser
+
+
+def _version():
+    from . import __version__
+    return f'%(prog)s {__version__}'
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import csv
+import os
+
+
+def read_inventor_tsv(tsv_file):
+    """Yield (headers, row dict) for every tool in an Inventor TSV
+
+    The first two lines are the 'version' / '14' header the converters write.
+    """
+    with open(tsv_file, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter='\t')
+        next(reader, None)  # 'version'
+        next(reader, None)  # '14'
+        headers = next(reader, None)
+        if headers is None:
+            return
+        for row in reader:
+            if row:
+                yield headers, dict(zip(headers, row))
+
+
+def removed_path(output_tsv):
+    """Where diff_inventor_tsv puts the tools that disappeared"""
+    stem, ext = os.path.splitext(output_tsv)
+    return f'{stem}_removed{ext or ".tsv"}'
+
+
+def diff_inventor_tsv(previous_tsv, current_tsv, output_tsv, removed_tsv=None):
+    """Write only the tools that were added or changed since previous_tsv
+
+    Tools are matched by their 'guid' column, which is stable across exports.
+    output_tsv gets the added and changed tools, in the same format as a full
+    export so Inventor can import it directly. Tools that are gone are
+    written to removed_tsv (by default <output>_removed.tsv).
+
+    Returns a dict with the number of added, changed, removed and unchanged tools.
+    """
+    if removed_tsv is None:
+        removed_tsv = removed_path(output_tsv)
+
+    # Only the previous export is held in memory; the current one streams through
+    previous = {}
+    previous_headers = None
+    for previous_headers, row in read_inventor_tsv(previous_tsv):
+        previous[row['guid']] = row
+
+    summary = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+    headers = previous_headers
+    with open(output_tsv, 'w', newline='', encoding='utf-8') as tsvfile:
+        writer = csv.writer(tsvfile, delimiter='\t')
+        header_written = False
+
+        for headers, row in read_inventor_tsv(current_tsv):
+            if not header_written:
+                _write_header(writer, headers)
+                header_written = True
+
+            old = previous.pop(row['guid'], None)
+            if old == row:
+                summary['unchanged'] += 1
+                continue
+            summary['added' if old is None else 'changed'] += 1
+            writer.writerow([row[name] for name in headers])
+
+        if not header_written and headers is not None:
+            _write_header(writer, headers)
+
+    # Whatever is left over no longer exists in the current export
+    with open(removed_tsv, 'w', newline='', encoding='utf-8') as tsvfile:
+        writer = csv.writer(tsvfile, delimiter='\t')
+        if previous_headers is not None:
+            _write_header(writer, previous_headers)
+        for row in previous.values():
+            writer.writerow([row.get(name, '') for name in previous_headers])
+            summary['removed'] += 1
+
+    return summary
+
+
+def _write_header(writer, headers):
+    writer.writerow(['version'])
+    writer.writerow(['14'])
+    writer.writerow(headers)
+
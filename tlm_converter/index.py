@@ -0,0 +1,308 @@
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .schema import LATHE_TYPE_MAP, MILL_TYPE_MAP
+from .tools import (
+    CONVERTER_VERSION, SubtreeIndex, extract_lathe_tool, extract_mill_tool, file_sha256,
+    iter_comp_tools, library_name,
+)
+from .unified import classify_tool
+
+# Bump when the tables below change; an older index is then rebuilt
+INDEX_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    library TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tools (
+    source_id INTEGER NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    number TEXT,
+    tool_number INTEGER,
+    name TEXT,
+    type_code TEXT,
+    type TEXT,
+    diameter REAL,
+    corner_radius REAL,
+    flute_length REAL,
+    shoulder_length REAL,
+    overall_length REAL,
+    num_flutes INTEGER,
+    spindle_rpm REAL,
+    cutting_feedrate REAL,
+    plunge_feedrate REAL
+);
+CREATE INDEX IF NOT EXISTS tools_source ON tools (source_id, position);
+CREATE INDEX IF NOT EXISTS tools_type ON tools (type COLLATE NOCASE, diameter);
+CREATE INDEX IF NOT EXISTS tools_diameter ON tools (diameter);
+CREATE INDEX IF NOT EXISTS tools_number ON tools (tool_number);
+'''
+
+TOOL_COLUMNS = ('position', 'kind', 'number', 'tool_number', 'name', 'type_code', 'type',
+                'diameter', 'corner_radius', 'flute_length', 'shoulder_length',
+                'overall_length', 'num_flutes', 'spindle_rpm', 'cutting_feedrate',
+                'plunge_feedrate')
+
+# .tlm name -> tools column, for range queries. For lathe tools R is the
+# insert nose radius and TL the holder's ToolLength; D, CL and SL are empty.
+RANGES = {
+    'D': 'diameter',
+    'R': 'corner_radius',
+    'CL': 'flute_length',
+    'SL': 'shoulder_length',
+    'TL': 'overall_length',
+    'NumFlutes': 'num_flutes',
+    'Spins': 'spindle_rpm',
+    'Feeds': 'cutting_feedrate',
+    'FeedZ': 'plunge_feedrate',
+}
+
+
+def _number(text, convert=float):
+    try:
+        return convert(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _mill_row(position, tool):
+    # The extractor only leaves body_length to be estimated when TL is there
+    overall = tool.overall_length if tool.body_length is None else None
+    return (position, 'mill', tool.number, _number(tool.number, int), tool.name,
+            tool.type_code, MILL_TYPE_MAP.get(tool.type_code, 'flat end mill'),
+            _number(tool.diameter), _number(tool.corner_radius), _number(tool.flute_length),
+            _number(tool.shoulder_length), _number(overall), _number(tool.num_flutes, int),
+            _number(tool.spindle_rpm), _number(tool.cutting_feedrate),
+            _number(tool.plunge_feedrate))
+
+
+def _lathe_row(position, tool):
+    return (position, 'lathe', tool.number, _number(tool.number, int),
+            f'{tool.name} - {tool.insert_name}',
+            tool.type_code, LATHE_TYPE_MAP.get(tool.type_code, 'turning general'),
+            None, _number(tool.corner_radius), None, None, _number(tool.tool_length), None,
+            _number(tool.spindle_rpm), _number(tool.cutting_feedrate), None)
+
+
+def read_tools(tlm_file, stream=True):
+    """Index rows (see TOOL_COLUMNS) for every mill and lathe tool in a .tlm
+
+    Uses the same classification and extractors as the converters, so the
+    index holds exactly the values a conversion would export (in mm).
+    """
+    rows = []
+    for position, tool in enumerate(iter_comp_tools(tlm_file, stream)):
+        index = SubtreeIndex(tool)
+        kind = classify_tool(tool, index)
+        if kind == 'mill':
+            rows.append(_mill_row(position, extract_mill_tool(tool, index)))
+        elif kind == 'lathe':
+            tool_data = extract_lathe_tool(tool, index)
+            if tool_data is not None:
+                rows.append(_lathe_row(position, tool_data))
+    return rows
+
+
+def _read_library(tlm_file, stream=True):
+    """(rows, None), or (None, error text) if the library can't be read
+
+    Runs in the worker processes, so one bad library is reported instead of
+    stopping the refresh, the way batch.convert_library does.
+    """
+    try:
+        return read_tools(tlm_file, stream), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+
+class LibraryIndex:
+    """Persistent SQLite index of the tools in many .tlm libraries
+
+    refresh() only parses libraries that are new or whose content changed:
+    a library with the same size and mtime as last time costs one stat, one
+    that was touched but is byte-identical costs one hash. query() then
+    answers from the indexed columns without reading any .tlm.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db = sqlite3.connect(db_path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self._check_version()
+
+    def _check_version(self):
+        version = f'{INDEX_VERSION}/{CONVERTER_VERSION}'
+        self.db.executescript(SCHEMA)
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is not None and row['value'] == version:
+            return
+        # Written by another index or converter version: start over
+        with self.db:
+            self.db.execute('DELETE FROM tools')
+            self.db.execute('DELETE FROM sources')
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def refresh(self, tlm_files, stream=True, workers=1, prune=True):
+        """Bring the index up to date with the given .tlm files
+
+        Changed libraries are parsed in up to `workers` processes (None: one
+        per CPU). With prune=True, libraries whose file no longer exists are
+        dropped from the index.
+
+        A library that can't be read or parsed is skipped and keeps whatever
+        was indexed for it before.
+
+        Returns a dict with the number of libraries indexed, unchanged and
+        removed, the number of tools (re)indexed, and 'failed': a list of
+        (path, error) for the libraries skipped.
+        """
+        summary = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'tools': 0, 'failed': []}
+        known = {row['path']: row for row in self.db.execute('SELECT * FROM sources')}
+
+        stale = []  # (path, stat, sha256) of libraries to parse
+        for tlm_file in tlm_files:
+            path = os.path.abspath(tlm_file)
+            try:
+                st = os.stat(path)
+                row = known.get(path)
+                if (row is not None and row['size'] == st.st_size
+                        and row['mtime_ns'] == st.st_mtime_ns):
+                    summary['unchanged'] += 1
+                    continue
+                sha256 = file_sha256(path)
+            except OSError as e:
+                summary['failed'].append((path, f'{type(e).__name__}: {e}'))
+                continue
+            if row is not None and row['sha256'] == sha256:
+                with self.db:
+                    self.db.execute('UPDATE sources SET size = ?, mtime_ns = ? WHERE id = ?',
+                                    (st.st_size, st.st_mtime_ns, row['id']))
+                summary['unchanged'] += 1
+                continue
+            stale.append((path, st, sha256))
+
+        if len(stale) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = pool.map(_read_library, [path for path, _, _ in stale],
+                                  [stream] * len(stale))
+                for (path, st, sha256), (rows, error) in zip(stale, parsed):
+                    self._store_or_fail(summary, path, st, sha256, rows, error)
+        else:
+            for path, st, sha256 in stale:
+                rows, error = _read_library(path, stream)
+                self._store_or_fail(summary, path, st, sha256, rows, error)
+
+        if prune:
+            gone = [row['id'] for path, row in known.items() if not os.path.exists(path)]
+            with self.db:
+                self.db.executemany('DELETE FROM sources WHERE id = ?', [(i,) for i in gone])
+            summary['removed'] = len(gone)
+        return summary
+
+    def _store_or_fail(self, summary, path, st, sha256, rows, error):
+        if error is not None:
+            summary['failed'].append((path, error))
+            return
+        summary['tools'] += self._store(path, st, sha256, rows)
+        summary['indexed'] += 1
+
+    def _store(self, path, st, sha256, rows):
+        """Replace everything indexed for one library in a single transaction"""
+        with self.db:
+            self.db.execute('DELETE FROM sources WHERE path = ?', (path,))
+            source_id = self.db.execute(
+                'INSERT INTO sources (path, library, size, mtime_ns, sha256, indexed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (path, library_name(path), st.st_size, st.st_mtime_ns, sha256, time.time()),
+            ).lastrowid
+            placeholders = ', '.join('?' * (len(TOOL_COLUMNS) + 1))
+            self.db.executemany(
+                f"INSERT INTO tools (source_id, {', '.join(TOOL_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                [(source_id,) + row for row in rows],
+            )
+        return len(rows)
+
+    def query(self, kind=None, tool_type=None, number=None, library=None, ranges=None,
+              limit=None):
+        """Tools matching every given filter, as dicts, in library/file order
+
+        tool_type matches the Inventor type ('flat end mill', case
+        insensitive) or the SOLIDWORKS ToolType code ('2'). ranges maps a
+        RANGES name to (low, high); either bound may be None for an open
+        range, both are inclusive.
+        """
+        where = []
+        params = []
+        if kind is not None:
+            where.append('t.kind = ?')
+            params.append(kind)
+        if tool_type is not None:
+            where.append('(t.type = ? COLLATE NOCASE OR t.type_code = ?)')
+            params += [tool_type, tool_type]
+        if number is not None:
+            where.append('t.tool_number = ?')
+            params.append(int(number))
+        if library is not None:
+            where.append('s.library = ?')
+            params.append(library)
+        for name, (low, high) in (ranges or {}).items():
+            try:
+                column = RANGES[name]
+            except KeyError:
+                raise ValueError(f"range must be one of {', '.join(RANGES)}, not {name!r}") from None
+            if low is not None:
+                where.append(f't.{column} >= ?')
+                params.append(low)
+            if high is not None:
+                where.append(f't.{column} <= ?')
+                params.append(high)
+
+        sql = ('SELECT s.library, s.path, t.* FROM tools t JOIN sources s ON s.id = t.source_id'
+               + (' WHERE ' + ' AND '.join(where) if where else '')
+               + ' ORDER BY s.library, t.position')
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def stats(self):
+        """Number of libraries and tools in the index"""
+        libraries, = self.db.execute('SELECT COUNT(*) FROM sources').fetchone()
+        tools, = self.db.execute('SELECT COUNT(*) FROM tools').fetchone()
+        return {'libraries': libraries, 'tools': tools}
+
+
+def parse_range(text):
+    """'6:10' -> (6.0, 10.0), '20:' -> (20.0, None), ':5' -> (None, 5.0), '4' -> (4.0, 4.0)"""
+    if ':' not in text:
+        value = float(text)
+        return value, value
+    low, high = text.split(':', 1)
+    return (float(low) if low.strip() else None,
+            float(high) if high.strip() else None)
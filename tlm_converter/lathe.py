@@ -0,0 +1,17 @@
+from .unified import _convert
+
+
+def convert_lathe_tlm_to_inventor_format(tlm_file, output_tsv, stream=False, library=None,
+                                         unit='mm', fmt='tsv', profiler=None, validation=None):
+    """Convert SOLIDWORKS lathe .tlm to Inventor lathe tool format
+
+    stream, library (the name GUIDs are derived from), unit ('mm' or
+    'inch'), fmt ('tsv', 'json' or 'parquet'), profiler and validation are
+    described in unified._convert.
+
+    Returns the number of tools written.
+    """
+    counts = _convert(tlm_file, {'lathe': output_tsv}, only='lathe', stream=stream,
+                      library=library, unit=unit, fmt=fmt, profiler=profiler,
+                      validation=validation)
+    return counts['lathe']
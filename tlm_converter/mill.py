@@ -0,0 +1,17 @@
+from .unified import _convert
+
+
+def convert_to_exact_inventor_format(tlm_file, output_tsv, stream=False, library=None,
+                                     unit='mm', fmt='tsv', profiler=None, validation=None):
+    """Convert to EXACT Inventor CAM TSV format
+
+    stream, library (the name GUIDs are derived from), unit ('mm' or
+    'inch'), fmt ('tsv', 'json' or 'parquet'), profiler and validation are
+    described in unified._convert.
+
+    Returns the number of tools written.
+    """
+    counts = _convert(tlm_file, {'mill': output_tsv}, only='mill', stream=stream,
+                      library=library, unit=unit, fmt=fmt, profiler=profiler,
+                      validation=validation)
+    return counts['mill']
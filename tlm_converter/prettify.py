@@ -0,0 +1,213 @@
+import os
+import sys
+from xml.parsers import expat
+
+from .profiling import NO_PROFILER
+
+# .tlm files are read and written as Latin-1, whatever they declare
+TLM_ENCODING = 'ISO-8859-1'
+
+
+def _escape(data):
+    # Same escaping minidom uses for both text and attribute values
+    return (data.replace("&", "&amp;").replace("<", "&lt;")
+                .replace("\"", "&quot;").replace(">", "&gt;"))
+
+
+class _BlankLineFilter:
+    """Pass text through to out, dropping lines that are only whitespace
+
+    Only the current line is held back, so memory doesn't grow with the file.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self.line = []
+        self.wrote_line = False
+
+    def write(self, text):
+        lines = text.split('\n')
+        for complete in lines[:-1]:
+            self.line.append(complete)
+            self._emit()
+        if lines[-1]:
+            self.line.append(lines[-1])
+
+    def close(self):
+        self._emit()
+
+    def _emit(self):
+        line = ''.join(self.line)
+        self.line = []
+        if line.strip():
+            # Lines are joined with '\n' - no newline after the last one
+            if self.wrote_line:
+                self.out.write('\n')
+            self.out.write(line)
+            self.wrote_line = True
+
+
+class _PrettyWriter:
+    """Indent XML as expat reports it, matching minidom's toprettyxml layout
+
+    Each open element keeps its start tag and any text seen so far until it
+    knows whether it ends up empty (<a/>), text-only (<a>text</a>) or has
+    child elements. Memory is bounded by nesting depth, not file size.
+    """
+
+    def __init__(self, out, indent='  '):
+        self.out = _BlankLineFilter(out)
+        self.indent = indent
+        self.stack = []  # [start tag, text parts, child elements written?]
+
+    def start(self, tag, attrs):
+        if self.stack:
+            self._open_for_children(len(self.stack) - 1)
+        parts = ['<', tag]
+        # attrs is a flat [name, value, name, value, ...] list in document order
+        for i in range(0, len(attrs), 2):
+            parts.append(f' {attrs[i]}="{_escape(attrs[i + 1])}"')
+        self.stack.append([''.join(parts), [], False])
+
+    def data(self, text):
+        self.stack[-1][1].append(text)
+
+    def end(self, tag):
+        start_tag, text, has_children = self.stack.pop()
+        pad = self.indent * len(self.stack)
+        if has_children:
+            self._flush_text(text, pad + self.indent)
+            self.out.write(f'{pad}</{tag}>\n')
+        elif text:
+            self.out.write(f'{pad}{start_tag}>{_escape("".join(text))}</{tag}>\n')
+        else:
+            self.out.write(f'{pad}{start_tag}/>\n')
+
+    def close(self):
+        self.out.close()
+
+    def _open_for_children(self, level):
+        frame = self.stack[level]
+        pad = self.indent * level
+        if not frame[2]:
+            self.out.write(f'{pad}{frame[0]}>\n')
+            frame[2] = True
+        self._flush_text(frame[1], pad + self.indent)
+        frame[1] = []
+
+    def _flush_text(self, text, pad):
+        if text:
+            self.out.write(pad + _escape(''.join(text)) + '\n')
+
+
+def write_pretty_tlm(tlm_file, out, indent='  ', profiler=None):
+    """Pretty-print a .tlm into the text stream out, one parser event at a time
+
+    With a profiling.Profiler, time in expat ('parse') and in the handlers
+    that indent and write ('write') is reported separately.
+    """
+    stages = profiler or NO_PROFILER
+    writer = _PrettyWriter(out, indent)
+
+    parser = expat.ParserCreate(encoding=TLM_ENCODING)
+    parser.buffer_text = True
+    parser.ordered_attributes = True
+    parser.StartElementHandler = stages.wrap('write', writer.start)
+    parser.EndElementHandler = stages.wrap('write', writer.end)
+    parser.CharacterDataHandler = stages.wrap('write', writer.data)
+
+    writer.out.write(f'<?xml version="1.0" encoding="{TLM_ENCODING}"?>\n')
+    with open(tlm_file, 'rb') as f:
+        stages.wrap('parse', parser.ParseFile)(f)
+    stages.wrap('write', writer.close)()
+
+
+def _output_path(tlm_file, output_xml, in_place):
+    """output_xml, defaulting to <name>_pretty.xml; None if it is tlm_file and not in_place"""
+    if output_xml is None:
+        output_xml = os.path.splitext(tlm_file)[0] + '_pretty.xml'
+    if not in_place and os.path.exists(output_xml) and os.path.samefile(output_xml, tlm_file):
+        print(f"❌ Error prettifying: {output_xml} is the .tlm itself, "
+              f"not overwriting it", file=sys.stderr)
+        return None
+    return output_xml
+
+
+def prettify_tlm(tlm_file, output_xml=None, profiler=None, in_place=False):
+    """Make .tlm file human-readable
+
+    The output is streamed to output_xml (default: <name>_pretty.xml) as the
+    file is parsed. output_xml may only be tlm_file itself with in_place=True.
+    Returns the output path, or None if the file couldn't be read or written
+    or isn't well-formed XML.
+    """
+    output_xml = _output_path(tlm_file, output_xml, in_place)
+    if output_xml is None:
+        return None
+
+    # Write next to the target and swap it in, so a failed run leaves
+    # nothing half-written (in place, the .tlm is only replaced once done)
+    tmp_xml = output_xml + '.tmp'
+    try:
+        with open(tmp_xml, 'w', encoding=TLM_ENCODING, errors='xmlcharrefreplace') as f:
+            write_pretty_tlm(tlm_file, f, profiler=profiler)
+        os.replace(tmp_xml, output_xml)
+    except (OSError, expat.ExpatError) as e:
+        # A file that can't be read or written, or a .tlm that isn't
+        # well-formed XML. Anything else is a bug and is raised.
+        print(f"❌ Error prettifying: {e}", file=sys.stderr)
+        return None
+    finally:
+        if os.path.exists(tmp_xml):
+            os.remove(tmp_xml)
+
+    return output_xml
+
+
+def prettify_tlm_minidom(tlm_file, output_xml=None, profiler=None, in_place=False):
+    """Make .tlm file human-readable via ElementTree + minidom
+
+    The original implementation: holds several copies of the document in
+    memory. Kept to check prettify_tlm's output against.
+    """
+    import xml.dom.minidom
+    import xml.etree.ElementTree as ET
+
+    stages = profiler or NO_PROFILER
+
+    output_xml = _output_path(tlm_file, output_xml, in_place)
+    if output_xml is None:
+        return None
+
+    # Read the .tlm file
+    with open(tlm_file, 'r', encoding='ISO-8859-1') as f:
+        content = stages.wrap('read', f.read)()
+
+    # Parse XML (even though it's .tlm extension)
+    try:
+        # Parse with ElementTree
+        root = stages.wrap('parse', ET.fromstring)(content)
+
+        # Convert to string with proper indentation
+        rough_string = stages.wrap('serialize', ET.tostring)(root, encoding='ISO-8859-1')
+        parsed = stages.wrap('minidom', xml.dom.minidom.parseString)(rough_string)
+        pretty_xml = stages.wrap('toprettyxml', parsed.toprettyxml)(indent="  ",
+                                                                    encoding='ISO-8859-1')
+
+        # Decode from bytes
+        pretty_xml_str = pretty_xml.decode('ISO-8859-1')
+
+        # Remove empty lines that minidom adds
+        lines = [line for line in pretty_xml_str.split('\n') if line.strip()]
+        pretty_xml_str = '\n'.join(lines)
+
+        # Write prettified version
+        with open(output_xml, 'w', encoding='ISO-8859-1') as f:
+            stages.wrap('write', f.write)(pretty_xml_str)
+
+        return output_xml
+
+    except (OSError, ET.ParseError, expat.ExpatError) as e:
+        print(f"❌ Error prettifying: {e}", file=sys.stderr)
+        return None
+
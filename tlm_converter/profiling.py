@@ -0,0 +1,160 @@
+import json
+import sys
+import time
+from collections import Counter
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None if unknown"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset // 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class Profiler:
+    """Opt-in timers, counters and peak memory for one conversion
+
+    The converters take a profiler and wrap the function behind each stage
+    (parse, index, extract, convert, guid, rows, write) with wrap(). A
+    stage's time is its self time: time spent in another wrapped stage
+    called from inside it (a ToolTable flush writing rows, say) goes to that
+    stage, so the stages add up to the instrumented total.
+
+    The extractors count skipped tools and every default they fall back to,
+    by XPath-like location (e.g. 'LenParams/R', 'Shape/@NumFlutes').
+
+    With cprofile_path, cProfile runs between start() and stop() and its
+    stats are dumped there; with trace_memory, tracemalloc reports the peak
+    Python heap too. Both slow the conversion down noticeably.
+    """
+
+    def __init__(self, cprofile_path=None, trace_memory=False):
+        self.cprofile_path = cprofile_path
+        self.trace_memory = trace_memory
+        self.stages = {}           # name -> [seconds, calls]
+        self.counters = Counter()
+        self.defaults = Counter()  # location -> times its default was used
+        self.seconds = None
+        self.peak_traced_kb = None
+        self._nested = 0.0         # time spent in stages below the current one
+        self._start = None
+        self._cprofile = None
+
+    def start(self):
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self._start
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+        if self.trace_memory:
+            import tracemalloc
+            self.peak_traced_kb = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def wrap(self, name, func):
+        """func, timed as stage `name`"""
+        entry = self.stages.setdefault(name, [0.0, 0])
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            outer = self._nested
+            self._nested = 0.0
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                entry[0] += elapsed - self._nested
+                entry[1] += 1
+                self._nested = outer + elapsed
+        return timed
+
+    def iterate(self, name, iterable):
+        """Yield from iterable, timing each step as stage `name`"""
+        step = self.wrap(name, iter(iterable).__next__)
+        while True:
+            try:
+                item = step()
+            except StopIteration:
+                return
+            yield item
+
+    def writer(self, out):
+        """Time a writers.ToolWriter: building rows, and writing them out"""
+        out.write_rows = self.wrap('write', out.write_rows)
+        return self.wrap('rows', out.write)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def default(self, location):
+        """The value at location was missing and its default was used"""
+        self.defaults[location] += 1
+
+    def report(self, **info):
+        """Everything measured, as a JSON-ready dict; info is added as is"""
+        report = dict(info)
+        report['seconds'] = self.seconds
+        report['stages'] = {
+            name: {'seconds': seconds, 'calls': calls}
+            for name, (seconds, calls) in self.stages.items() if calls
+        }
+        counters = dict(self.counters)
+        counters['defaults_used'] = sum(self.defaults.values())
+        report['counters'] = counters
+        report['defaults'] = dict(self.defaults.most_common())
+        report['peak_rss_kb'] = peak_rss_kb()
+        if self.peak_traced_kb is not None:
+            report['peak_traced_kb'] = self.peak_traced_kb
+        if self.cprofile_path:
+            report['cprofile'] = self.cprofile_path
+        return report
+
+    def write_report(self, path, **info):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**info), f, indent=2)
+            f.write('\n')
+
+
+class _NoProfiler:
+    """Stands in for a Profiler when profiling is off: every hook is free"""
+
+    def wrap(self, name, func):
+        return func
+
+    def iterate(self, name, iterable):
+        return iterable
+
+    def writer(self, out):
+        return out.write
+
+    def count(self, name, n=1):
+        pass
+
+
+NO_PROFILER = _NoProfiler()
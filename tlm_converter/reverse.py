@@ -0,0 +1,220 @@
+import os
+from xml.sax.saxutils import quoteattr
+
+from .diff import read_inventor_tsv
+from .prettify import TLM_ENCODING
+from .schema import LATHE_TYPE_MAP, MILL_TYPE_MAP, RECORD_TYPES, SCHEMAS, field
+from .table import COLUMNS, MM_PER_INCH, format_decimal
+
+# Inventor type -> SOLIDWORKS tool type code
+MILL_TYPE_CODES = {inventor: code for code, inventor in MILL_TYPE_MAP.items()}
+LATHE_TYPE_CODES = {inventor: code for code, inventor in LATHE_TYPE_MAP.items()}
+
+
+class XmlWriter:
+    """Write XML one element at a time, indented, straight to a text file
+
+    Only the stack of open tag names is kept, so a library of any size is
+    written in constant memory.
+    """
+
+    def __init__(self, out, indent='  '):
+        self.out = out
+        self.indent = indent
+        self._open = []
+
+    def declaration(self, encoding):
+        self.out.write(f'<?xml version="1.0" encoding="{encoding}"?>\n')
+
+    def start(self, tag, attrs=None):
+        self.out.write(f'{self.indent * len(self._open)}<{tag}{self._attrs(attrs)}>\n')
+        self._open.append(tag)
+
+    def element(self, tag, attrs=None):
+        """An empty element, e.g. <D Val="10"/>"""
+        self.out.write(f'{self.indent * len(self._open)}<{tag}{self._attrs(attrs)}/>\n')
+
+    def end(self):
+        tag = self._open.pop()
+        self.out.write(f'{self.indent * len(self._open)}</{tag}>\n')
+
+    def _attrs(self, attrs):
+        if not attrs:
+            return ''
+        # None means "leave the attribute out"
+        return ''.join(f' {name}={quoteattr(value)}'
+                       for name, value in attrs.items() if value is not None)
+
+
+def _columns_to_fields(kind):
+    """Inventor column -> record field, for the columns that are a plain field"""
+    mapping = {}
+    seen = set()
+    for column in SCHEMAS[kind]:
+        if isinstance(column.value, field) and column.value.name not in seen:
+            mapping[column.name] = column.value.name
+            seen.add(column.value.name)
+    return mapping
+
+
+COLUMN_FIELDS = {
+    'mill': _columns_to_fields('mill'),
+    'lathe': _columns_to_fields('lathe'),
+}
+
+
+def _inches_to_mm(text):
+    # Inch exports keep 6 decimals, i.e. mm to within 0.0000127. Rounding to
+    # 4 decimals gives back the exact .tlm value for anything with 4 or fewer
+    # decimals, so the tool converts to the same GUID again.
+    try:
+        return format_decimal(round(float(text) * MM_PER_INCH, 4))
+    except ValueError:
+        return text
+
+
+def tool_from_row(kind, row):
+    """Rebuild the MillTool/LatheTool a TSV row was written from
+
+    Values come back in mm, whatever unit the row is in. Fields the TSV
+    doesn't carry (e.g. the insert thickness) are None.
+    """
+    record_type = RECORD_TYPES[kind]
+    values = dict.fromkeys(record_type._fields)
+    for column, name in COLUMN_FIELDS[kind].items():
+        if column in row:
+            values[name] = row[column]
+
+    if row.get('unit') == 'inches':
+        columns = COLUMNS[kind]
+        for name in columns['length'] + columns['feed']:
+            if values[name] is not None:
+                values[name] = _inches_to_mm(values[name])
+
+    if kind == 'mill':
+        values['type_code'] = MILL_TYPE_CODES.get(row.get('type'), '2')
+    else:
+        values['type_code'] = LATHE_TYPE_CODES.get(row.get('type'), '16')
+        # The description is '<holder> - <insert>' (see lathe_description)
+        holder, sep, insert = row.get('description', '').rpartition(' - ')
+        if sep:
+            values['name'], values['insert_name'] = holder, insert
+        else:
+            values['name'], values['insert_name'] = insert, 'Insert'
+    return record_type(**values)
+
+
+def write_mill_tool(xml, tool):
+    """One CompTool[@Type="0"] laid out the way extract_mill_tool reads it"""
+    xml.start('CompTool', {'Type': '0', 'ToolNumber': tool.number, 'Name': tool.name})
+    xml.start('CompTool', {'Type': '1', 'Name': tool.name, 'ToolType': tool.type_code})
+
+    xml.start('Shape', {'NumFlutes': tool.num_flutes})
+    xml.start('LenParams')
+    xml.element('D', {'Val': tool.diameter})
+    xml.element('R', {'Val': tool.corner_radius})
+    xml.element('CL', {'Val': tool.flute_length})
+    xml.element('SL', {'Val': tool.shoulder_length})
+    # The converter only exports an overall length when TL is there
+    if tool.overall_length not in (None, '0'):
+        xml.element('TL', {'Val': tool.overall_length})
+    if tool.type_code in ['0', '18']:  # Drill or center drill
+        xml.element('TipL', {'Val': tool.tip_length})
+    xml.end()  # LenParams
+    xml.end()  # Shape
+
+    xml.start('CuttingConditionsList')
+    xml.start('CC')
+    xml.start('MillingFeedSpin')
+    xml.element('Feeds', {'Normal': tool.cutting_feedrate, 'LeadIn': tool.entry_feedrate,
+                          'LeadOut': tool.exit_feedrate, 'Z': tool.plunge_feedrate})
+    xml.element('Spins', {'Rate': tool.spindle_rpm})
+    xml.end()  # MillingFeedSpin
+    xml.end()  # CC
+    xml.end()  # CuttingConditionsList
+
+    xml.end()  # CompTool Type="1"
+    xml.end()  # CompTool Type="0"
+
+
+def write_lathe_tool(xml, tool):
+    """One CompTool[@Type="0"] laid out the way extract_lathe_tool reads it"""
+    xml.start('CompTool', {'Type': '0', 'ToolNumber': tool.number,
+                           'Name': f'{tool.name} - {tool.insert_name}'})
+    xml.start('CompTool', {'Type': '5', 'Name': tool.name})
+    xml.element('Shape', {'ShankHeight': tool.shank_height, 'ShankWidth': tool.shank_width,
+                          'ToolLength': tool.tool_length,
+                          'ApproachAngleGUI': tool.approach_angle})
+
+    xml.start('CompTool', {'Type': '1', 'Name': tool.insert_name, 'ToolType': tool.type_code})
+    xml.element('Shape', {'InsertCornerRadius': tool.corner_radius,
+                          'InsertCuttingEdgeLength': tool.insert_size,
+                          'InsertThickness': tool.insert_thickness,
+                          'InsertNoseAngle': tool.nose_angle})
+    xml.start('CuttingConditionsList')
+    xml.start('CC')
+    xml.start('TurningFeedSpin')
+    xml.element('Feeds', {'Normal': tool.cutting_feedrate})
+    xml.element('Spins', {'Normal': tool.spindle_rpm})
+    xml.end()  # TurningFeedSpin
+    xml.end()  # CC
+    xml.end()  # CuttingConditionsList
+    xml.end()  # CompTool Type="1"
+
+    xml.end()  # CompTool Type="5"
+    xml.end()  # CompTool Type="0"
+
+
+def tsv_kind(headers):
+    """'lathe' or 'mill', from the column set of an Inventor TSV"""
+    return 'lathe' if 'compensation-offset' in headers else 'mill'
+
+
+def tsv_to_tlm(tsv_files, output_tlm, library=None):
+    """Write the tools of one or more Inventor TSVs into a SOLIDWORKS .tlm
+
+    Mill and lathe TSVs (version 14, as the converters write them) can be
+    mixed; their tools end up in one library, in file order. The XML is
+    written as the rows are read, to output_tlm + '.tmp' which replaces
+    output_tlm only once it is complete.
+
+    The .tlm holds what the converters read back (CompTool Type 0/1/5,
+    Shape/LenParams, CuttingConditionsList), so converting it again gives
+    the same TSV rows. Inch TSVs are converted back to mm.
+
+    Returns a dict with the number of mill and lathe tools written.
+    """
+    if isinstance(tsv_files, str):
+        tsv_files = [tsv_files]
+    library = library or os.path.splitext(os.path.basename(output_tlm))[0]
+    counts = {'mill': 0, 'lathe': 0}
+
+    tmp_path = output_tlm + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding=TLM_ENCODING, errors='xmlcharrefreplace',
+                  newline='\r\n', buffering=1 << 20) as out:
+            xml = XmlWriter(out)
+            xml.declaration(TLM_ENCODING)
+            xml.start('ToolLibrary', {'Name': library})
+            xml.start('Tools')
+
+            for tsv_file in tsv_files:
+                kind = None
+                for headers, row in read_inventor_tsv(tsv_file):
+                    if kind is None:
+                        kind = tsv_kind(headers)
+                    tool = tool_from_row(kind, row)
+                    if kind == 'mill':
+                        write_mill_tool(xml, tool)
+                    else:
+                        write_lathe_tool(xml, tool)
+                    counts[kind] += 1
+
+            xml.end()  # Tools
+            xml.end()  # ToolLibrary
+        os.replace(tmp_path, output_tlm)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return counts
@@ -0,0 +1,193 @@
+from collections import namedtuple
+
+# Map SOLIDWORKS tool types to Inventor tool types
+MILL_TYPE_MAP = {
+    '20': 'face mill',          # Face mill
+    '2': 'flat end mill',       # End mill
+    '0': 'drill',               # Drill
+    '18': 'center drill',       # Center drill
+    '12': 'tap',                # Tap
+    '10': 'chamfer mill',       # Chamfer mill
+    '15': 'ball end mill'       # Ball nose
+}
+
+# Map SOLIDWORKS lathe tool types to Inventor types
+LATHE_TYPE_MAP = {
+    '16': 'turning general',      # Profile turning
+    '18': 'turning threading',    # Threading
+    '17': 'turning grooving',     # Grooving
+    '19': 'turning parting',      # Parting (similar to grooving)
+    '20': 'turning boring'        # Boring
+}
+
+
+# One output column: its Inventor name, where its value comes from, and
+# whether it holds a number (for the formats that keep types). value is a
+# constant string, field('x') for the record's x, a function of the
+# MillTool/LatheTool record, or UNIT / GUID for the export's unit name and
+# the tool's GUID.
+Column = namedtuple('Column', ['name', 'value', 'numeric'])
+field = namedtuple('field', ['name'])
+
+UNIT = object()
+GUID = object()
+
+
+def text(name, value):
+    return Column(name, value, False)
+
+
+def number(name, value):
+    return Column(name, value, True)
+
+
+def _mill_type(tool_data):
+    return MILL_TYPE_MAP.get(tool_data.type_code, 'flat end mill')
+
+
+def _lathe_type(tool_data):
+    return LATHE_TYPE_MAP.get(tool_data.type_code, 'turning general')
+
+
+def lathe_description(tool_data):
+    """Lathe tools are described by holder and insert, e.g. 'OD Rough - CNMG 432'"""
+    return f"{tool_data.name} - {tool_data.insert_name}"
+
+
+# Inventor columns for milling tools (in EXACT order from your file)
+MILL_SCHEMA = [
+    text('type', _mill_type),
+    text('unit', UNIT),
+    text('description', field('name')),
+    text('comment', lambda t: f'Converted from SOLIDWORKS T{t.number}'),
+    text('manufacturer', 'SOLIDWORKS'),
+    text('product-id', lambda t: f'SW-{t.number}'),
+    text('product-link', ''),
+    number('number', field('number')),
+    number('turret', '0'),                          # 0 for milling
+    number('diameter-offset', '1'),
+    number('length-offset', '1'),
+    text('live-tool', 'no'),
+    text('break-control', 'no'),
+    text('manual-tool-change', 'no'),
+    number('diameter', field('diameter')),
+    number('tip-diameter', field('tip_diameter')),
+    number('tip-length', field('tip_length')),
+    number('corner-radius', field('corner_radius')),
+    number('taper-angle', '0'),
+    number('taper-angle2', '0'),
+    number('flute-length', field('flute_length')),
+    number('shoulder-length', field('shoulder_length')),
+    number('shaft-diameter', field('shaft_diameter')),
+    number('body-length', field('body_length')),
+    number('overall-length', field('overall_length')),
+    number('number-of-flutes', field('num_flutes')),
+    number('thread-pitch', '0'),                    # except taps
+    text('coolant-support', 'no'),
+    text('coolant-mode', 'flood'),
+    text('material-name', 'hss'),
+    number('spindle-rpm', field('spindle_rpm')),
+    number('ramp-spindle-rpm', field('ramp_spindle_rpm')),
+    text('clockwise', 'yes'),
+    number('cutting-feedrate', field('cutting_feedrate')),
+    number('entry-feedrate', field('entry_feedrate')),
+    number('exit-feedrate', field('exit_feedrate')),
+    number('plunge-feedrate', field('plunge_feedrate')),
+    number('ramp-feedrate', field('cutting_feedrate')),  # same as cutting
+    number('retract-feedrate', '0'),
+    text('holder', ''),                             # optional
+    text('shaft', ''),                              # optional
+    text('guid', GUID),
+    text('holder-description', ''),
+    text('holder-comment', ''),
+    text('holder-vendor', ''),
+    text('holder-product-id', ''),
+    text('holder-guid', ''),
+    text('holder-library-name', ''),
+]
+
+# Inventor columns for lathe tools (from your example)
+LATHE_SCHEMA = [
+    text('type', _lathe_type),
+    text('unit', UNIT),
+    text('description', lathe_description),
+    text('comment', lambda t: f'Converted from SOLIDWORKS T{t.number}'),
+    text('manufacturer', 'SOLIDWORKS'),
+    text('product-id', lambda t: f'SW-LATHE-{t.number}'),
+    text('product-link', ''),
+    number('number', field('number')),
+    number('turret', field('number')),              # usually same as tool# for lathes
+    number('compensation-offset', field('number')),  # usually same as tool#
+    text('break-control', 'no'),
+    text('manual-tool-change', 'no'),
+    number('diameter', '0'),                        # not used for lathe inserts
+    number('tip-diameter', '0'),
+    number('tip-length', '0'),
+    number('corner-radius', field('corner_radius')),  # NOSE RADIUS for lathe
+    number('taper-angle', '0'),
+    number('taper-angle2', '0'),
+    number('flute-length', field('insert_size')),   # insert cutting edge length
+    number('shoulder-length', field('shank_height')),
+    number('shaft-diameter', field('shank_width')),
+    number('body-length', field('tool_length')),
+    number('overall-length', field('overall_length')),  # estimated
+    number('number-of-flutes', '1'),                # always 1 for lathe inserts
+    number('thread-pitch', field('thread_pitch')),  # for threading tools
+    text('coolant-support', 'no'),
+    text('coolant-mode', 'flood'),
+    text('material-name', 'carbide'),
+    number('spindle-rpm', field('spindle_rpm')),
+    number('ramp-spindle-rpm', field('spindle_rpm')),
+    text('clockwise', 'yes'),
+    number('cutting-feedrate', field('cutting_feedrate')),  # mm/rev
+    number('entry-feedrate', field('cutting_feedrate')),
+    number('exit-feedrate', field('cutting_feedrate')),
+    number('plunge-feedrate', field('cutting_feedrate')),
+    number('ramp-feedrate', field('cutting_feedrate')),
+    number('retract-feedrate', '0'),
+    text('holder', ''),
+    text('shaft', ''),
+    text('guid', GUID),
+    text('holder-description', ''),
+    text('holder-comment', ''),
+    text('holder-vendor', ''),
+    text('holder-product-id', ''),
+    text('holder-guid', ''),
+    text('holder-library-name', ''),
+]
+
+SCHEMAS = {
+    'mill': MILL_SCHEMA,
+    'lathe': LATHE_SCHEMA,
+}
+
+MILL_HEADERS = [column.name for column in MILL_SCHEMA]
+LATHE_HEADERS = [column.name for column in LATHE_SCHEMA]
+
+
+# Everything the mill row builder needs from one tool, as the raw .tlm strings.
+# body_length is None when it is to be estimated from overall_length (see
+# table.DERIVED).
+MillTool = namedtuple('MillTool', [
+    'number', 'name', 'type_code',
+    'diameter', 'tip_diameter', 'tip_length', 'corner_radius',
+    'flute_length', 'shoulder_length', 'shaft_diameter', 'body_length',
+    'overall_length', 'num_flutes',
+    'spindle_rpm', 'ramp_spindle_rpm', 'cutting_feedrate', 'entry_feedrate',
+    'exit_feedrate', 'plunge_feedrate',
+])
+
+# Everything the lathe row builder needs from one tool, as the raw .tlm strings.
+# overall_length is always estimated from tool_length (see table.DERIVED).
+LatheTool = namedtuple('LatheTool', [
+    'number', 'name', 'insert_name', 'type_code',
+    'corner_radius', 'insert_size', 'insert_thickness', 'nose_angle',
+    'shank_height', 'shank_width', 'tool_length', 'overall_length', 'approach_angle',
+    'cutting_feedrate', 'spindle_rpm', 'thread_pitch',
+])
+
+
+RECORD_TYPES = {
+    'mill': MillTool,
+    'lathe': LatheTool,
+}
@@ -0,0 +1,166 @@
+from array import array
+
+MM_PER_INCH = 25.4
+
+# --unit value -> what Inventor expects in the 'unit' column
+UNITS = {
+    'mm': 'millimeters',
+    'inch': 'inches',
+}
+
+# Numeric fields of each record type, held as float64 columns.
+# Lengths and feeds (mm/min for mills, mm/rev for lathes) are divided by
+# 25.4 for inch exports; spindle speeds are the same in both.
+COLUMNS = {
+    'mill': {
+        'length': ('diameter', 'tip_diameter', 'tip_length', 'corner_radius',
+                   'flute_length', 'shoulder_length', 'shaft_diameter', 'overall_length'),
+        'feed': ('cutting_feedrate', 'entry_feedrate', 'exit_feedrate', 'plunge_feedrate'),
+        'rpm': ('spindle_rpm', 'ramp_spindle_rpm'),
+    },
+    'lathe': {
+        'length': ('corner_radius', 'insert_size', 'insert_thickness', 'shank_height',
+                   'shank_width', 'tool_length', 'thread_pitch'),
+        'feed': ('cutting_feedrate',),
+        'rpm': ('spindle_rpm',),
+    },
+}
+
+# Fields the .tlm doesn't have, estimated from another column (in mm).
+# The extractors leave them as None where they should be filled in.
+# field -> (source field, scale, offset)
+DERIVED = {
+    'mill': {'body_length': ('overall_length', 0.8, 0.0)},
+    'lathe': {'overall_length': ('tool_length', 1.0, 20.0)},
+}
+
+# Tools held before the columns are converted and written out. Big enough
+# for the batched math to pay off, small enough to keep streaming flat.
+CHUNK_SIZE = 4096
+
+# Below this many rows plain Python beats the cost of handing off to NumPy
+NUMPY_MIN_ROWS = 256
+
+_numpy = None
+
+
+def _load_numpy():
+    """NumPy if it's installed, else False (only tried once)"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+def _parse(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def affine(values, scale=1.0, offset=0.0):
+    """values * scale + offset for a whole float64 column, as a list of floats"""
+    numpy = _load_numpy() if len(values) >= NUMPY_MIN_ROWS else False
+    if numpy:
+        column = numpy.frombuffer(values, dtype=numpy.float64)
+        return (column * scale + offset).tolist()
+    return [v * scale + offset for v in values]
+
+
+def format_decimal(value):
+    """Value with up to 6 decimals and no trailing zeros, e.g. '0.393701'"""
+    text = f'{value:.6f}'.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
+class ToolTable:
+    """Column store for a batch of MillTool or LatheTool records
+
+    Records are kept as they come; the numeric fields the export actually
+    has to compute are also parsed once into float64 arrays. When the table
+    fills up (or on flush()), unit conversion and derived fields are
+    computed a whole column at a time, the converted records are handed to
+    write_record in order, and the table is emptied again.
+
+    For mm exports every value read from the .tlm is written exactly as it
+    was (only the derived fields are computed), so mm rows stay identical
+    to earlier exports. Values that aren't numbers are always passed through.
+    """
+    __slots__ = ('kind', 'unit', 'unit_name', 'chunk_size', '_write', '_records',
+                 '_columns', '_scale', '_derived')
+
+    def __init__(self, kind, write_record, unit='mm', chunk_size=CHUNK_SIZE):
+        if unit not in UNITS:
+            raise ValueError(f"unit must be one of {', '.join(UNITS)}, not {unit!r}")
+        self.kind = kind
+        self.unit = unit
+        self.unit_name = UNITS[unit]
+        self.chunk_size = chunk_size
+        self._write = write_record
+        self._records = []
+        self._scale = 1.0 if unit == 'mm' else 1.0 / MM_PER_INCH
+        self._derived = DERIVED[kind]
+
+        # Spindle speeds never change, and mm exports only compute the
+        # derived fields, so only the columns the math reads are parsed
+        names = [source for source, _, _ in self._derived.values()]
+        if unit != 'mm':
+            columns = COLUMNS[kind]
+            names += [name for name in columns['length'] + columns['feed']
+                      if name not in names]
+        self._columns = {name: array('d') for name in names}
+
+    def __len__(self):
+        return len(self._records)
+
+    def append(self, record):
+        self._records.append(record)
+        for name, column in self._columns.items():
+            column.append(_parse(getattr(record, name)))
+        if len(self._records) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Convert and write out everything appended so far"""
+        records = self._records
+        if not records:
+            return
+        record_type = type(records[0])
+        fields = record_type._fields
+        to_unit = self._scale
+        fmt = str if to_unit == 1.0 else format_decimal
+
+        # One list per field, rewritten in place for the converted ones
+        columns = list(zip(*records))
+
+        if to_unit != 1.0:
+            for name, values in self._columns.items():
+                i = fields.index(name)
+                columns[i] = [
+                    text if value != value else fmt(value)  # NaN: keep the text
+                    for text, value in zip(columns[i], affine(values, to_unit))
+                ]
+
+        for name, (source, scale, offset) in self._derived.items():
+            i = fields.index(name)
+            # Derive in mm, then convert; the same affine map does both
+            values = affine(self._columns[source], scale * to_unit, offset * to_unit)
+            columns[i] = [
+                text if text is not None
+                else '0' if value != value
+                else fmt(value)
+                for text, value in zip(columns[i], values)
+            ]
+
+        write = self._write
+        for record in map(record_type._make, zip(*columns)):
+            write(record)
+
+        self._records = []
+        for column in self._columns.values():
+            del column[:]
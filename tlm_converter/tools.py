@@ -0,0 +1,371 @@
+from bisect import bisect_right
+import hashlib
+import os
+import uuid
+import xml.etree.ElementTree as ET
+
+from .schema import LatheTool, MillTool
+
+# Bump whenever the rows the converters write change, so cached
+# conversions made by an older version are not reused
+CONVERTER_VERSION = '2'
+
+# Fixed namespace for tool GUIDs - changing it changes every GUID we export
+GUID_NAMESPACE = uuid.UUID('bbee19b6-186a-4cb5-a48f-09032a27e197')
+
+
+def iter_comp_tools(tlm_file, stream=False):
+    """Yield every top-level CompTool[@Type="0"] in a .tlm file
+
+    With stream=True the file is read with iterparse instead of ET.parse.
+    Each tool is yielded as soon as its closing tag arrives and is dropped
+    from the tree once the caller is done with it, so memory stays flat
+    and the first rows can be written before the whole file is read.
+    """
+    if not stream:
+        root = ET.parse(tlm_file).getroot()
+        yield from root.findall('.//CompTool[@Type="0"]')
+        return
+
+    parents = []     # open elements, outermost first
+    open_tools = 0   # how many CompTool[@Type="0"] we are currently inside
+
+    for event, elem in ET.iterparse(tlm_file, events=('start', 'end')):
+        is_tool = elem.tag == 'CompTool' and elem.get('Type') == '0'
+
+        if event == 'start':
+            parents.append(elem)
+            if is_tool:
+                open_tools += 1
+            continue
+
+        parents.pop()
+        if is_tool:
+            open_tools -= 1
+            if open_tools == 0:
+                yield elem
+
+        # Anything that closes outside a tool is no longer needed
+        # (this includes the tool we just handed out)
+        if open_tools == 0 and parents:
+            elem.clear()
+            parents[-1].remove(elem)
+
+
+def library_name(tlm_file):
+    """Name a library by its file name, e.g. 'ToolKit_Haas_MiniMill_251007'"""
+    return os.path.splitext(os.path.basename(tlm_file))[0]
+
+
+def is_library(path):
+    """True for a .tlm file; SOLIDWORKS writes both .tlm and .TLM"""
+    return os.path.splitext(path)[1].lower() == '.tlm'
+
+
+def file_sha256(path):
+    """sha256 of a file's content, read a MB at a time"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ToolGuids:
+    """Stable Inventor GUIDs for the tools of one library
+
+    Each GUID is a uuid5 of library name + ToolNumber + tool definition name,
+    so exporting the same library again gives the same GUIDs and Inventor
+    only sees the tools that really changed. If the same identity shows up
+    twice in one library, the repeats get a counter so GUIDs stay unique.
+    """
+
+    def __init__(self, library):
+        self.library = library
+        self._seen = {}
+
+    def __call__(self, number, name):
+        identity = f'{self.library}|{number}|{name}'
+        repeats = self._seen.get(identity, 0)
+        self._seen[identity] = repeats + 1
+        if repeats:
+            identity += f'|{repeats}'
+        return '{' + str(uuid.uuid5(GUID_NAMESPACE, identity)).upper() + '}'
+
+
+class SubtreeIndex:
+    """Single-pass index over one CompTool subtree
+
+    The subtree is walked once; every element gets its document-order
+    position and is bucketed by tag (CompTools also by their Type). A
+    './/Tag' search below any element then becomes a bisect into that
+    bucket instead of another walk of the subtree.
+    """
+    __slots__ = ('_order', '_pos', '_buckets')
+
+    def __init__(self, root):
+        self._order = order = list(root.iter())
+        self._pos = pos = {}
+        self._buckets = buckets = {}
+        for n, elem in enumerate(order):
+            pos[elem] = n
+            tag = elem.tag
+            bucket = buckets.get(tag)
+            if bucket is None:
+                buckets[tag] = [n]
+            else:
+                bucket.append(n)
+            if tag == 'CompTool':
+                buckets.setdefault(('CompTool', elem.get('Type')), []).append(n)
+
+    def find(self, key, within):
+        """First descendant of `within` matching key, like within.find('.//key')
+
+        key is a tag name, or ('CompTool', type) for CompTool[@Type="type"].
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None or within is None:
+            return None
+        start = self._pos[within]
+        i = bisect_right(bucket, start)
+        if i == len(bucket):
+            return None
+
+        # The subtree ends right after its last, deepest descendant
+        last = within
+        while len(last):
+            last = last[-1]
+        if bucket[i] > self._pos[last]:
+            return None
+        return self._order[bucket[i]]
+
+
+# Locations the profiler reports defaults under
+TOOL = 'CompTool[@Type="0"]'
+TOOL_DEF = 'CompTool[@Type="1"]'
+TURNING_TOOL = 'CompTool[@Type="5"]'
+
+
+def _attr(elem, name, default, profiler=None, where=None):
+    """elem.get(name, default), telling the profiler when the default is used"""
+    value = elem.get(name)
+    if value is None:
+        if profiler is not None:
+            profiler.default(f'{where or elem.tag}/@{name}')
+        return default
+    return value
+
+
+def _val(parent, tag, default='0', profiler=None):
+    elem = parent.find(tag)
+    if elem is None:
+        if profiler is not None:
+            profiler.default(f'{parent.tag}/{tag}')
+        return default
+    return _attr(elem, 'Val', default, profiler, f'{parent.tag}/{tag}')
+
+
+def extract_mill_tool(tool, index=None, profiler=None):
+    """Read a CompTool[@Type="0"] into a MillTool (None if it has no Type="1")
+
+    With a profiling.Profiler, skipped tools and every default used are counted.
+    """
+    if index is None:
+        index = SubtreeIndex(tool)
+
+    # Find tool definition
+    tool_def = index.find(('CompTool', '1'), tool)
+    if tool_def is None:
+        if profiler is not None:
+            profiler.count('skipped_no_tool_def')
+        return None
+
+    tool_type_code = _attr(tool_def, 'ToolType', '2', profiler, TOOL_DEF)
+
+    # Extract geometry
+    diameter = '0'
+    corner_radius = '0'
+    flute_length = '0'
+    shoulder_length = '0'
+    shaft_diameter = '0'
+    body_length = '0'
+    overall_length = '0'
+    num_flutes = '2'
+    tip_length = '0'
+    tip_diameter = '0'
+
+    shape = index.find('Shape', tool_def)
+    if shape is not None:
+        len_params = index.find('LenParams', shape)
+        if len_params is not None:
+            diameter = _val(len_params, 'D', diameter, profiler)
+            shaft_diameter = diameter  # For mills, shaft = diameter
+            corner_radius = _val(len_params, 'R', profiler=profiler)
+            flute_length = _val(len_params, 'CL', profiler=profiler)
+            shoulder_length = _val(len_params, 'SL', profiler=profiler)
+            if len_params.find('TL') is not None:
+                overall_length = _val(len_params, 'TL', profiler=profiler)
+                body_length = None  # Estimated by the ToolTable
+            elif profiler is not None:
+                profiler.default('LenParams/TL')
+
+            # Tip dimensions for drills
+            if tool_type_code in ['0', '18']:  # Drill or center drill
+                tip_length = _val(len_params, 'TipL', profiler=profiler)
+        elif profiler is not None:
+            profiler.default('LenParams')
+
+        # Number of flutes
+        num_flutes = _attr(shape, 'NumFlutes', '2', profiler)
+    elif profiler is not None:
+        profiler.default('Shape')
+
+    # Extract cutting conditions
+    spindle_rpm = '3500'
+    cutting_feedrate = '1000'
+    entry_feedrate = '100'
+    exit_feedrate = '100'
+    plunge_feedrate = '300'
+
+    cc = index.find('CC', index.find('CuttingConditionsList', tool_def))
+    milling = index.find('MillingFeedSpin', cc)
+    if milling is not None:
+        feeds = index.find('Feeds', milling)
+        spins = index.find('Spins', milling)
+
+        if feeds is not None:
+            cutting_feedrate = _attr(feeds, 'Normal', '1000', profiler)
+            entry_feedrate = _attr(feeds, 'LeadIn', '100', profiler)
+            exit_feedrate = _attr(feeds, 'LeadOut', '100', profiler)
+            plunge_feedrate = _attr(feeds, 'Z', '300', profiler)
+        elif profiler is not None:
+            profiler.default('MillingFeedSpin/Feeds')
+
+        if spins is not None:
+            spindle_rpm = _attr(spins, 'Rate', '3500', profiler)
+        elif profiler is not None:
+            profiler.default('MillingFeedSpin/Spins')
+    elif profiler is not None:
+        profiler.default('MillingFeedSpin')
+
+    return MillTool(
+        number=_attr(tool, 'ToolNumber', '1', profiler, TOOL),
+        name=_attr(tool_def, 'Name', 'Tool', profiler, TOOL_DEF),
+        type_code=tool_type_code,
+        diameter=diameter,
+        tip_diameter=tip_diameter,
+        tip_length=tip_length,
+        corner_radius=corner_radius,
+        flute_length=flute_length,
+        shoulder_length=shoulder_length,
+        shaft_diameter=shaft_diameter,
+        body_length=body_length,
+        overall_length=overall_length,
+        num_flutes=num_flutes,
+        spindle_rpm=spindle_rpm,
+        ramp_spindle_rpm=spindle_rpm,
+        cutting_feedrate=cutting_feedrate,
+        entry_feedrate=entry_feedrate,
+        exit_feedrate=exit_feedrate,
+        plunge_feedrate=plunge_feedrate,
+    )
+
+
+def extract_lathe_tool(tool, index=None, profiler=None):
+    """Read a CompTool[@Type="0"] into a LatheTool
+
+    Returns None if the tool has no turning holder (Type="5") or the holder
+    has no insert definition (Type="1"). With a profiling.Profiler, skipped
+    tools and every default used are counted.
+    """
+    if index is None:
+        index = SubtreeIndex(tool)
+
+    # Find turning tool (Type="5") and its insert definition (Type="1")
+    turning_tool = index.find(('CompTool', '5'), tool)
+    if turning_tool is None:
+        if profiler is not None:
+            profiler.count('skipped_no_turning_tool')
+        return None
+    insert_def = index.find(('CompTool', '1'), turning_tool)
+    if insert_def is None:
+        if profiler is not None:
+            profiler.count('skipped_no_insert_def')
+        return None
+
+    tool_type_code = _attr(insert_def, 'ToolType', '16', profiler, TOOL_DEF)
+
+    # Insert geometry - for lathe tools the key parameters are different
+    corner_radius = '0'  # Nose radius
+    insert_size = '0'    # Insert cutting edge length
+    insert_thickness = '0'
+    nose_angle = '0'
+
+    shape = index.find('Shape', insert_def)
+    if shape is not None:
+        corner_radius = _attr(shape, 'InsertCornerRadius', '0', profiler, 'Insert/Shape')
+        insert_size = _attr(shape, 'InsertCuttingEdgeLength', '0', profiler, 'Insert/Shape')
+        insert_thickness = _attr(shape, 'InsertThickness', '0', profiler, 'Insert/Shape')
+        nose_angle = _attr(shape, 'InsertNoseAngle', '0', profiler, 'Insert/Shape')
+    elif profiler is not None:
+        profiler.default('Insert/Shape')
+
+    # Tool holder geometry (from the Type="5" CompTool's Shape)
+    shank_height = '25'  # Default
+    shank_width = '25'
+    tool_length = '150'
+    approach_angle = '95'  # Default
+
+    tool_shape = index.find('Shape', turning_tool)
+    if tool_shape is not None:
+        shank_height = _attr(tool_shape, 'ShankHeight', '25', profiler, 'Holder/Shape')
+        shank_width = _attr(tool_shape, 'ShankWidth', '25', profiler, 'Holder/Shape')
+        tool_length = _attr(tool_shape, 'ToolLength', '150', profiler, 'Holder/Shape')
+        approach_angle = _attr(tool_shape, 'ApproachAngleGUI', '95', profiler, 'Holder/Shape')
+    elif profiler is not None:
+        profiler.default('Holder/Shape')
+
+    # Cutting conditions (TURNING specific)
+    cutting_feedrate = '0.1'  # mm/rev for turning
+    spindle_rpm = '1000'
+
+    turning = index.find('TurningFeedSpin', index.find('CC', insert_def))
+    if turning is not None:
+        feeds = index.find('Feeds', turning)
+        spins = index.find('Spins', turning)
+
+        if feeds is not None:
+            cutting_feedrate = _attr(feeds, 'Normal', '0.1', profiler)
+        elif profiler is not None:
+            profiler.default('TurningFeedSpin/Feeds')
+
+        if spins is not None:
+            spindle_rpm = _attr(spins, 'Normal', '1000', profiler)
+        elif profiler is not None:
+            profiler.default('TurningFeedSpin/Spins')
+    elif profiler is not None:
+        profiler.default('TurningFeedSpin')
+
+    # Special handling for different lathe tool types
+    thread_pitch = '0'
+    if tool_type_code == '18':  # Threading tool
+        thread_pitch = '1'  # Default, should extract from XML if available
+
+    return LatheTool(
+        number=_attr(tool, 'ToolNumber', '1', profiler, TOOL),
+        name=_attr(turning_tool, 'Name', 'Lathe Tool', profiler, TURNING_TOOL),
+        insert_name=_attr(insert_def, 'Name', 'Insert', profiler, TOOL_DEF),
+        type_code=tool_type_code,
+        corner_radius=corner_radius,
+        insert_size=insert_size,
+        insert_thickness=insert_thickness,
+        nose_angle=nose_angle,
+        shank_height=shank_height,
+        shank_width=shank_width,
+        tool_length=tool_length,
+        overall_length=None,
+        approach_angle=approach_angle,
+        cutting_feedrate=cutting_feedrate,
+        spindle_rpm=spindle_rpm,
+        thread_pitch=thread_pitch,
+    )
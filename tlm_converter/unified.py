@@ -0,0 +1,126 @@
+from .profiling import NO_PROFILER
+from .table import UNITS, ToolTable
+from .schema import lathe_description
+from .tools import (
+    SubtreeIndex, ToolGuids, extract_lathe_tool, extract_mill_tool, iter_comp_tools,
+    library_name,
+)
+from .writers import open_writer
+
+
+def classify_tool(tool, index):
+    """'lathe' for a turning holder (Type="5"), 'mill' for a bare Type="1", else None
+
+    The holder check comes first: a turning tool also has a Type="1" (its
+    insert) further down, which the mill converter alone would pick up.
+    """
+    if index.find(('CompTool', '5'), tool) is not None:
+        return 'lathe'
+    if index.find(('CompTool', '1'), tool) is not None:
+        return 'mill'
+    return None
+
+
+def _tool_writer(kind, out, library, stages=NO_PROFILER):
+    """Callback that hands one converted record of the given kind to its writer"""
+    tool_guids = stages.wrap('guid', ToolGuids(library))
+    write_row = stages.writer(out)
+
+    def write_tool(tool_data):
+        if kind == 'mill':
+            tool_guid = tool_guids(tool_data.number, tool_data.name)
+        else:
+            tool_guid = tool_guids(tool_data.number, lathe_description(tool_data))
+        write_row(tool_data, tool_guid)
+    return write_tool
+
+
+def convert_mixed_library(tlm_file, mill_tsv=None, lathe_tsv=None, stream=True,
+                          library=None, unit='mm', fmt='tsv', profiler=None, validation=None):
+    """Convert a library holding both milling and turning tools in one parse
+
+    Every top-level CompTool is classified and routed to the mill or lathe
+    row builder, so each tool lands in exactly one of the two TSVs. Pass
+    None for either output to drop that kind of tool. unit, fmt, profiler
+    and validation work as for the single converters (see _convert).
+
+    Returns a dict with the number of mill, lathe and skipped tools.
+    """
+    return _convert(tlm_file, {'mill': mill_tsv, 'lathe': lathe_tsv}, stream=stream,
+                    library=library, unit=unit, fmt=fmt, profiler=profiler,
+                    validation=validation)
+
+
+def _convert(tlm_file, paths, only=None, stream=True, library=None, unit='mm', fmt='tsv',
+             profiler=None, validation=None):
+    """The conversion loop behind every converter
+
+    paths maps 'mill' and 'lathe' to an output path, or None to drop that
+    kind. Tools are classified and routed to their kind, unless `only` is
+    set: then every tool goes through that kind's extractor, as the single
+    converters do (so the mill converter exports a turning tool's insert).
+
+    With stream=True the .tlm is read incrementally and rows are written a
+    ToolTable chunk at a time, so huge libraries convert in flat memory.
+    unit is 'mm' or 'inch'; fmt picks the writer (see writers.WRITERS).
+    GUIDs are derived from the library name (the .tlm file name unless
+    library is given), tool number and name, so they survive re-exports.
+    A profiling.Profiler times each stage and counts skipped tools and
+    defaults used; a validate.ValidationReport checks each tool as it is
+    read (with fail_fast, ValidationFailed stops the run).
+
+    Returns a dict with the number of mill, lathe and skipped tools.
+    """
+    library = library or library_name(tlm_file)
+    counts = {'mill': 0, 'lathe': 0, 'skipped': 0}
+    stages = profiler or NO_PROFILER
+    # Without a profiler these are the plain functions
+    index_tool = stages.wrap('index', SubtreeIndex)
+    classify = stages.wrap('classify', classify_tool)
+    extract = {'mill': stages.wrap('extract', extract_mill_tool),
+               'lathe': stages.wrap('extract', extract_lathe_tool)}
+
+    outputs = {}
+    try:
+        for kind, path in paths.items():
+            if path is None:
+                continue
+            out = open_writer(fmt, path, kind, UNITS[unit])
+            # Separate GUID sequences, same as running each converter on its own
+            table = ToolTable(kind, _tool_writer(kind, out, library, stages), unit)
+            outputs[kind] = (out, table, stages.wrap('convert', table.append))
+
+        if validation is not None:
+            from .validate import check_tool  # it needs classify_tool from here
+
+        for position, tool in enumerate(stages.iterate('parse',
+                                                       iter_comp_tools(tlm_file, stream)), 1):
+            # Single pass over the tool's subtree
+            index = index_tool(tool)
+            if validation is not None:
+                check_tool(tool, index, position, validation, only)
+            kind = only or classify(tool, index)
+            if kind not in outputs:
+                counts['skipped'] += 1
+                stages.count('skipped_no_tool_def' if kind is None
+                             else f'skipped_{kind}_not_written')
+                continue
+
+            # The extractors count why they skip a tool (no Type="1", no insert)
+            tool_data = extract[kind](tool, index, profiler)
+            if tool_data is None:
+                counts['skipped'] += 1
+                continue
+
+            outputs[kind][2](tool_data)
+            counts[kind] += 1
+
+        for _, table, _ in outputs.values():
+            stages.wrap('convert', table.flush)()
+    finally:
+        for out, _, _ in outputs.values():
+            out.close()
+
+    stages.count('tools_seen', counts['mill'] + counts['lathe'] + counts['skipped'])
+    stages.count('tools_written', counts['mill'] + counts['lathe'])
+    return counts
@@ -0,0 +1,290 @@
+import math
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from .tools import TOOL_DEF, TURNING_TOOL, SubtreeIndex, iter_comp_tools
+from .unified import classify_tool
+
+# One problem found in a library. location is XPath-like, e.g.
+# (//CompTool[@Type="0"])[12]/CompTool[@Type="1"]//LenParams/D/@Val
+Issue = namedtuple('Issue', ['level', 'location', 'message'])
+
+
+class ValidationFailed(Exception):
+    """Raised on the first error when validating with fail_fast=True"""
+
+    def __init__(self, report):
+        issue = report.first_error
+        super().__init__(f"{issue.location}: {issue.message}")
+        self.report = report
+
+
+class ValidationReport:
+    """Errors and warnings found in one library, in bounded memory
+
+    Only the first max_issues issues are kept; the rest are just counted
+    (first_error is always kept).
+    Errors are what would make a converted tool wrong or missing (values
+    that aren't numbers or out of range, tools the converters skip).
+    Warnings are values the converters replace with a default.
+    With fail_fast=True the first error raises ValidationFailed.
+    """
+
+    def __init__(self, source=None, max_issues=100, fail_fast=False):
+        self.source = source
+        self.max_issues = max_issues
+        self.fail_fast = fail_fast
+        self.issues = []
+        self.first_error = None
+        self.errors = 0
+        self.warnings = 0
+        self.tools = 0
+        self.complete = True  # False if the scan stopped early
+        self._numbers = {}    # ToolNumber -> position of its first tool
+
+    @property
+    def ok(self):
+        return self.errors == 0
+
+    @property
+    def dropped(self):
+        """Issues counted but not kept because of max_issues"""
+        return self.errors + self.warnings - len(self.issues)
+
+    def add(self, level, location, message):
+        issue = Issue(level, location, message)
+        if level == 'error':
+            self.errors += 1
+            if self.first_error is None:
+                self.first_error = issue
+        else:
+            self.warnings += 1
+        if len(self.issues) < self.max_issues:
+            self.issues.append(issue)
+
+    def error(self, location, message):
+        self.add('error', location, message)
+        if self.fail_fast:
+            self.complete = False
+            raise ValidationFailed(self)
+
+    def warning(self, location, message):
+        self.add('warning', location, message)
+
+    def first_use(self, number, position):
+        """Position of the first tool numbered `number`, remembering this one if it is"""
+        return self._numbers.setdefault(number, position)
+
+    def summary(self):
+        text = f"{self.tools} tools, {self.errors} errors, {self.warnings} warnings"
+        return text if self.complete else text + " (stopped early)"
+
+    def as_dict(self):
+        return {'source': self.source, 'tools': self.tools, 'errors': self.errors,
+                'warnings': self.warnings, 'complete': self.complete,
+                'summary': self.summary(), 'dropped': self.dropped,
+                'first_error': self.first_error and self.first_error._asdict(),
+                'issues': [issue._asdict() for issue in self.issues]}
+
+
+def _number(report, location, text, low=0.0, strict=False, high=None, integer=False):
+    """Check that text is a number in range; the value, or None if it isn't"""
+    try:
+        value = int(text) if integer else float(text)
+    except ValueError:
+        kind = 'an integer' if integer else 'a number'
+        report.error(location, f"{text!r} is not {kind}")
+        return None
+    if not math.isfinite(value):
+        report.error(location, f"{text!r} is not a finite number")
+        return None
+    if value < low or (strict and value == low):
+        report.error(location, f"{text} must be {'>' if strict else '>='} {low:g}")
+    elif high is not None and value > high:
+        report.error(location, f"{text} must be <= {high:g}")
+    return value
+
+
+def _attribute(report, elem, name, location, default, **limits):
+    """Check one attribute the converters read; warn if they'd use default"""
+    text = elem.get(name)
+    if text is None:
+        report.warning(f'{location}/@{name}', f"missing, {default} is used")
+        return None
+    return _number(report, f'{location}/@{name}', text, **limits)
+
+
+def _len_param(report, len_params, tag, location, default='0', required=False, **limits):
+    elem = len_params.find(tag)
+    if elem is None:
+        if required:
+            report.error(f'{location}/{tag}',
+                         f"missing, the tool would be exported with {tag}={default}")
+        else:
+            report.warning(f'{location}/{tag}', f"missing, {default} is used")
+        return None
+    text = elem.get('Val')
+    if text is None:
+        (report.error if required else report.warning)(f'{location}/{tag}/@Val',
+                                                       f"missing, {default} is used")
+        return None
+    return _number(report, f'{location}/{tag}/@Val', text, **limits)
+
+
+def _check_mill(report, tool_def, index, where):
+    where = f'{where}/{TOOL_DEF}'
+    shape = index.find('Shape', tool_def)
+    len_params = index.find('LenParams', shape) if shape is not None else None
+    if len_params is None:
+        report.error(f'{where}//LenParams', "missing, the tool would be exported with D=0")
+    else:
+        location = f'{where}//LenParams'
+        diameter = _len_param(report, len_params, 'D', location, required=True,
+                              strict=True)
+        radius = _len_param(report, len_params, 'R', location)
+        flute_length = _len_param(report, len_params, 'CL', location)
+        _len_param(report, len_params, 'SL', location)
+        overall_length = _len_param(report, len_params, 'TL', location)
+        if tool_def.get('ToolType') in ['0', '18']:  # Drill or center drill
+            _len_param(report, len_params, 'TipL', location)
+
+        if diameter is not None and radius is not None and radius > diameter / 2:
+            report.error(f'{location}/R/@Val', f"corner radius {radius:g} is more than D/2")
+        if (flute_length is not None and overall_length is not None
+                and flute_length > overall_length > 0):
+            report.warning(f'{location}/CL/@Val', f"flute length {flute_length:g} is "
+                                                   f"longer than the tool ({overall_length:g})")
+    if shape is not None:
+        _attribute(report, shape, 'NumFlutes', f'{where}//Shape', '2', low=1, integer=True)
+
+    cc = index.find('CC', index.find('CuttingConditionsList', tool_def))
+    milling = index.find('MillingFeedSpin', cc)
+    location = f'{where}//MillingFeedSpin'
+    if milling is None:
+        report.warning(location, "missing, default feeds and speeds are used")
+        return
+    feeds = index.find('Feeds', milling)
+    if feeds is None:
+        report.warning(f'{location}/Feeds', "missing, default feeds are used")
+    else:
+        _attribute(report, feeds, 'Normal', f'{location}/Feeds', '1000', strict=True)
+        _attribute(report, feeds, 'LeadIn', f'{location}/Feeds', '100')
+        _attribute(report, feeds, 'LeadOut', f'{location}/Feeds', '100')
+        _attribute(report, feeds, 'Z', f'{location}/Feeds', '300')
+    spins = index.find('Spins', milling)
+    if spins is None:
+        report.warning(f'{location}/Spins', "missing, 3500 rpm is used")
+    else:
+        _attribute(report, spins, 'Rate', f'{location}/Spins', '3500', strict=True)
+
+
+def _check_lathe(report, turning_tool, index, where):
+    where = f'{where}/{TURNING_TOOL}'
+    insert_def = index.find(('CompTool', '1'), turning_tool)
+    if insert_def is None:
+        report.error(f'{where}//{TOOL_DEF}', "no insert definition, the tool is skipped")
+        return
+
+    shape = index.find('Shape', turning_tool)
+    location = f'{where}//Shape'
+    if shape is None:
+        report.warning(location, "missing, default holder dimensions are used")
+    else:
+        _attribute(report, shape, 'ShankHeight', location, '25', strict=True)
+        _attribute(report, shape, 'ShankWidth', location, '25', strict=True)
+        _attribute(report, shape, 'ToolLength', location, '150', strict=True)
+        _attribute(report, shape, 'ApproachAngleGUI', location, '95', high=180)
+
+    insert_where = f'{where}//{TOOL_DEF}'
+    shape = index.find('Shape', insert_def)
+    location = f'{insert_where}//Shape'
+    if shape is None:
+        report.warning(location, "missing, the insert is exported with zero size")
+    else:
+        _attribute(report, shape, 'InsertCornerRadius', location, '0')
+        _attribute(report, shape, 'InsertCuttingEdgeLength', location, '0')
+        _attribute(report, shape, 'InsertThickness', location, '0')
+        _attribute(report, shape, 'InsertNoseAngle', location, '0', high=180)
+
+    turning = index.find('TurningFeedSpin', index.find('CC', insert_def))
+    location = f'{insert_where}//TurningFeedSpin'
+    if turning is None:
+        report.warning(location, "missing, default feed and speed are used")
+        return
+    feeds = index.find('Feeds', turning)
+    if feeds is None:
+        report.warning(f'{location}/Feeds', "missing, 0.1 mm/rev is used")
+    else:
+        _attribute(report, feeds, 'Normal', f'{location}/Feeds', '0.1', strict=True)
+    spins = index.find('Spins', turning)
+    if spins is None:
+        report.warning(f'{location}/Spins', "missing, 1000 rpm is used")
+    else:
+        _attribute(report, spins, 'Normal', f'{location}/Spins', '1000', strict=True)
+
+
+def check_tool(tool, index, position, report, expect=None):
+    """Check one top-level CompTool the way the converters will read it
+
+    position is the tool's 1-based place in the library, used in locations.
+    expect ('mill' or 'lathe') is the converter the tool is headed for.
+    Returns the tool's kind, or None if no converter can use it.
+    """
+    report.tools += 1
+    where = f'(//CompTool[@Type="0"])[{position}]'
+
+    number = tool.get('ToolNumber')
+    if number is None:
+        report.warning(f'{where}/@ToolNumber', "missing, tool number 1 is used")
+    elif _number(report, f'{where}/@ToolNumber', number, integer=True) is not None:
+        first = report.first_use(number, position)
+        if first != position:
+            report.warning(f'{where}/@ToolNumber',
+                           f"tool number {number} is also used by tool {first}")
+
+    kind = classify_tool(tool, index)
+    if kind is None:
+        report.error(where, f"no {TOOL_DEF} or {TURNING_TOOL}, the tool is skipped")
+        return None
+    if expect == 'lathe' and kind == 'mill':
+        report.error(where, f"no {TURNING_TOOL}, the lathe converter skips it")
+        return None
+    if expect == 'mill' and kind == 'lathe':
+        report.warning(where, "a lathe tool, the mill converter exports its insert as a mill")
+        _check_mill(report, index.find(('CompTool', '1'), tool), index, where)
+        return kind
+
+    if kind == 'mill':
+        _check_mill(report, index.find(('CompTool', '1'), tool), index, where)
+    else:
+        _check_lathe(report, index.find(('CompTool', '5'), tool), index, where)
+    return kind
+
+
+def validate_tlm(tlm_file, kind=None, stream=True, max_issues=100, fail_fast=False):
+    """Check every tool in a .tlm without converting anything
+
+    One streaming pass in flat memory; kind ('mill' or 'lathe') checks the
+    tools against that converter, None against the mixed converter. With
+    fail_fast=True the scan stops at the first error. XML that isn't
+    well-formed and files that can't be read are reported as errors too.
+
+    Returns a ValidationReport.
+    """
+    report = ValidationReport(tlm_file, max_issues, fail_fast)
+    try:
+        for position, tool in enumerate(iter_comp_tools(tlm_file, stream), 1):
+            check_tool(tool, SubtreeIndex(tool), position, report, kind)
+    except ValidationFailed:
+        pass
+    except ET.ParseError as e:
+        line, column = e.position
+        report.complete = False
+        report.add('error', f'line {line}, column {column}', f"not well-formed XML: {e}")
+    except OSError as e:
+        report.complete = False
+        report.add('error', tlm_file, f"can't read: {e.strerror or e}")
+    else:
+        if report.tools == 0:
+            report.warning('//CompTool[@Type="0"]', "no tools found")
+    return report
@@ -0,0 +1,376 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import signal
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import find_libraries, load_converter, output_path
+from .tools import file_sha256, is_library
+
+# inotify(7) constants, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+# A .tlm is only worth looking at once it has been written and closed, or
+# moved into place (SOLIDWORKS and most editors save via a temp file)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MOVED_FROM | IN_DELETE
+
+# struct inotify_event: int wd; uint32 mask, cookie, len; char name[len]
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _walk_dirs(directory, recursive):
+    if not recursive:
+        return [directory]
+    return [dirpath for dirpath, _, _ in os.walk(directory)]
+
+
+class InotifyWatcher:
+    """Report changed .tlm files with Linux inotify, through ctypes
+
+    The inotify descriptor is registered with the event loop, so nothing
+    runs between saves. Raises OSError where inotify isn't available.
+    """
+
+    def __init__(self, directories, recursive=False):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or libc_name is None:
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError("this C library has no inotify")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.recursive = recursive
+        self._dirs = {}  # watch descriptor -> directory
+        for directory in directories:
+            for path in _walk_dirs(directory, recursive):
+                self._add(path)
+        self._loop = None
+
+    def _add(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"can't watch {directory}")
+        self._dirs[wd] = directory
+
+    def start(self, loop, on_change, on_overflow):
+        self._loop = loop
+        loop.add_reader(self._fd, self._read, on_change, on_overflow)
+
+    def _read(self, on_change, on_overflow):
+        while True:
+            try:
+                data = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:  # events were dropped, look at everything
+                    on_overflow()
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                        for subdir in _walk_dirs(path, True):
+                            try:
+                                self._add(subdir)
+                            except OSError:  # already gone again
+                                pass
+                        on_overflow()  # pick up libraries already inside it
+                elif is_library(path) and mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    on_change(path)
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Report changed .tlm files by comparing size and mtime every interval
+
+    For network shares and platforms without inotify. One scan is one stat
+    per library.
+    """
+
+    def __init__(self, directories, recursive=False, interval=1.0):
+        self.directories = directories
+        self.recursive = recursive
+        self.interval = interval
+        self._seen = self._scan()
+        self._task = None
+
+    def _scan(self):
+        seen = {}
+        for path in find_libraries(self.directories, self.recursive):
+            try:
+                st = os.stat(path)
+            except OSError:  # deleted while scanning
+                continue
+            seen[path] = (st.st_size, st.st_mtime_ns)
+        return seen
+
+    def start(self, loop, on_change, on_overflow):
+        self._task = loop.create_task(self._poll(on_change))
+
+    async def _poll(self, on_change):
+        while True:
+            await asyncio.sleep(self.interval)
+            seen = self._scan()
+            for path, signature in seen.items():
+                if self._seen.get(path) != signature:
+                    on_change(path)
+            self._seen = seen
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+def open_watcher(directories, recursive=False, poll=False, interval=1.0):
+    """inotify where it works, polling otherwise (or when poll=True)"""
+    if not poll:
+        try:
+            return InotifyWatcher(directories, recursive)
+        except OSError:
+            pass
+    return PollingWatcher(directories, recursive, interval)
+
+
+def _write_atomic(path, write):
+    """Call write(tmp_path), then move tmp_path over path
+
+    The temp file sits next to path, so the rename is atomic and a reader
+    (Inventor) sees either the old file or the new one, never half of one.
+    """
+    # Not mkstemp: its 0600 mode would survive the rename, and nobody else
+    # (or Inventor on a share) could read the output
+    tmp_path = path + '.tmp'
+    try:
+        result = write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return result
+
+
+def library_outputs(tlm_file, kind, output_dir=None, fmt='tsv', prettify=False):
+    """output name -> path for everything watch mode writes for one library"""
+    kinds = ['mill', 'lathe'] if kind == 'both' else [kind]
+    outputs = {k: output_path(tlm_file, k, output_dir, fmt) for k in kinds}
+    if prettify:
+        stem = os.path.splitext(os.path.basename(tlm_file))[0]
+        outputs['pretty'] = os.path.join(output_dir or os.path.dirname(tlm_file),
+                                         stem + '_pretty.xml')
+    return outputs
+
+
+def process_library(tlm_file, kind, outputs, stream=True, unit='mm', fmt='tsv'):
+    """Convert (and prettify) one library; runs in the worker processes
+
+    Every output is written to a temp file and renamed into place. Errors are
+    reported in the result, as text, like batch.convert_library does.
+    """
+    result = {'source': tlm_file, 'outputs': outputs, 'tools': 0, 'error': None}
+    start = time.perf_counter()
+    try:
+        if kind == 'both':
+            from .unified import convert_mixed_library
+            # Both TSVs come from one parse; rename them together at the end
+            tmp = {k: outputs[k] + '.tmp' for k in ('mill', 'lathe')}
+            try:
+                counts = convert_mixed_library(tlm_file, tmp['mill'], tmp['lathe'],
+                                               stream=stream, unit=unit, fmt=fmt)
+                for k, path in tmp.items():
+                    os.replace(path, outputs[k])
+            finally:
+                for path in tmp.values():
+                    if os.path.exists(path):
+                        os.remove(path)
+            result['tools'] = counts['mill'] + counts['lathe']
+        else:
+            convert = load_converter(kind)
+            result['tools'] = _write_atomic(
+                outputs[kind],
+                lambda path: convert(tlm_file, path, stream=stream, unit=unit, fmt=fmt))
+
+        if 'pretty' in outputs:
+            from .prettify import prettify_tlm
+            if prettify_tlm(tlm_file, outputs['pretty']) is None:
+                raise RuntimeError("prettify failed")
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+class LibraryWatcher:
+    """Reconvert libraries as they change, on an asyncio loop
+
+    Change events for a library are debounced: it is only converted once no
+    new event has come in for `debounce` seconds, so a burst of saves costs
+    one conversion. Conversions run in a process pool, several libraries at
+    a time, but never two for the same library; a change that arrives while
+    one is running queues exactly one more run. A library saved without any
+    change to its content isn't converted again.
+    """
+
+    def __init__(self, directories, kind='both', output_dir=None, recursive=False,
+                 workers=None, debounce=0.5, poll=False, interval=1.0, prettify=False,
+                 stream=True, unit='mm', fmt='tsv', report=print):
+        self.directories = directories
+        self.kind = kind
+        self.output_dir = output_dir
+        self.recursive = recursive
+        self.workers = workers
+        self.debounce = debounce
+        self.poll = poll
+        self.interval = interval
+        self.prettify = prettify
+        self.stream = stream
+        self.unit = unit
+        self.fmt = fmt
+        self.report = report
+        self._timers = {}    # path -> pending debounce timer
+        self._running = set()
+        self._again = set()  # changed again while being converted
+        self._hashes = {}    # path -> content hash at the last conversion
+        self._pending = set()  # pool futures, cancelled on shutdown
+        self._loop = None
+        self._pool = None
+
+    def outputs(self, tlm_file):
+        return library_outputs(tlm_file, self.kind, self.output_dir, self.fmt, self.prettify)
+
+    def stale_libraries(self):
+        """Libraries with an output that is missing or older than the .tlm"""
+        stale = []
+        for tlm_file in find_libraries(self.directories, self.recursive):
+            mtime = os.path.getmtime(tlm_file)
+            for path in self.outputs(tlm_file).values():
+                if not os.path.exists(path) or os.path.getmtime(path) < mtime:
+                    stale.append(tlm_file)
+                    break
+        return stale
+
+    def changed(self, tlm_file):
+        """A change event: (re)start the debounce timer for this library"""
+        timer = self._timers.pop(tlm_file, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[tlm_file] = self._loop.call_later(self.debounce, self._settled, tlm_file)
+
+    def rescan(self):
+        """Events may have been lost: queue everything that is out of date"""
+        for tlm_file in self.stale_libraries():
+            self.changed(tlm_file)
+
+    def _settled(self, tlm_file):
+        del self._timers[tlm_file]
+        if tlm_file in self._running:
+            self._again.add(tlm_file)
+            return
+        self._running.add(tlm_file)
+        self._loop.create_task(self._convert(tlm_file))
+
+    async def _convert(self, tlm_file):
+        try:
+            while True:
+                self._again.discard(tlm_file)
+                await self._convert_once(tlm_file)
+                if tlm_file not in self._again:
+                    break
+        finally:
+            self._running.discard(tlm_file)
+
+    async def _convert_once(self, tlm_file):
+        try:
+            digest = await self._loop.run_in_executor(None, file_sha256, tlm_file)
+        except OSError:  # deleted (or moved away) before it settled
+            return
+        if self._hashes.get(tlm_file) == digest and not self._missing_outputs(tlm_file):
+            return
+
+        future = self._pool.submit(process_library, tlm_file, self.kind,
+                                   self.outputs(tlm_file), self.stream, self.unit, self.fmt)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        result = await asyncio.wrap_future(future)
+        if result['error']:
+            self.report(f"❌ {tlm_file}: {result['error']}")
+            return
+        self._hashes[tlm_file] = digest
+        self.report(f"{tlm_file} -> {', '.join(result['outputs'].values())} "
+                    f"({result['tools']} tools, {result['seconds']:.2f}s)")
+
+    def _missing_outputs(self, tlm_file):
+        return any(not os.path.exists(path) for path in self.outputs(tlm_file).values())
+
+    async def run(self, initial=True):
+        """Watch until cancelled; with initial=True, first bring stale outputs up to date"""
+        self._loop = asyncio.get_running_loop()
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        watcher = open_watcher(self.directories, self.recursive, self.poll, self.interval)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            watcher.start(self._loop, self.changed, self.rescan)
+            self.report(f"Watching {', '.join(self.directories)} "
+                        f"({'polling' if isinstance(watcher, PollingWatcher) else 'inotify'})")
+            if initial:
+                self.rescan()
+            await asyncio.Event().wait()  # until cancelled (Ctrl+C, SIGTERM)
+        finally:
+            watcher.close()
+            for timer in self._timers.values():
+                timer.cancel()
+            # Drop queued conversions, let running ones finish (shutdown's
+            # cancel_futures needs Python 3.9)
+            for future in list(self._pending):
+                future.cancel()
+            self._pool.shutdown(wait=True)
+
+
+async def _run_until_stopped(watcher):
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, task.cancel)
+        except (NotImplementedError, RuntimeError):  # Windows: Ctrl+C still works
+            pass
+    try:
+        await watcher.run()
+    except asyncio.CancelledError:
+        pass
+
+
+def watch(directories, **options):
+    """Run a LibraryWatcher until Ctrl+C or SIGTERM"""
+    try:
+        asyncio.run(_run_until_stopped(LibraryWatcher(directories, **options)))
+    except KeyboardInterrupt:
+        pass
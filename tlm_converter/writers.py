@@ -0,0 +1,252 @@
+import csv
+import json
+import math
+from operator import itemgetter
+
+from .schema import GUID, RECORD_TYPES, SCHEMAS, UNIT, field
+
+
+def row_builder(kind, unit):
+    """Function (tool_data, tool_guid) -> tuple of column values, in schema order
+
+    Constant columns (and the unit, fixed for one export) are looked up
+    once; per row only the computed columns call back into Python, and the
+    row is picked out of constants + record + GUID in a single itemgetter.
+    """
+    fields = RECORD_TYPES[kind]._fields
+    constants = []
+    computed = []
+    # Where each column's value sits in constants + tool_data + (guid,) + computed
+    positions = []
+    for column in SCHEMAS[kind]:
+        value = column.value
+        if isinstance(value, field):
+            positions.append(('record', fields.index(value.name)))
+        elif value is GUID:
+            positions.append(('guid', 0))
+        elif callable(value):
+            positions.append(('computed', len(computed)))
+            computed.append(value)
+        else:
+            positions.append(('constant', len(constants)))
+            constants.append(unit if value is UNIT else value)
+
+    offsets = {'constant': 0, 'record': len(constants),
+               'guid': len(constants) + len(fields),
+               'computed': len(constants) + len(fields) + 1}
+    pick = itemgetter(*[offsets[source] + i for source, i in positions])
+    constants = tuple(constants)
+
+    def build(tool_data, tool_guid):
+        return pick(constants + tool_data + (tool_guid,)
+                    + tuple([get(tool_data) for get in computed]))
+    return build
+
+
+def to_number(value):
+    """'12' -> 12, '0.5' -> 0.5; anything that isn't a number is returned as is"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    # JSON has no NaN or Infinity
+    return number if math.isfinite(number) else value
+
+
+class ToolWriter:
+    """Base class for the output formats
+
+    Rows are built from the kind's column schema (schema.SCHEMAS) and
+    buffered; every chunk_size rows they are handed to write_rows() in one
+    go. A format only has to implement write_rows() and, if it needs one,
+    a header in __init__ and a footer in close().
+    """
+    extension = None
+    chunk_size = 4096
+
+    def __init__(self, path, kind, unit='millimeters'):
+        self.path = path
+        self.kind = kind
+        self.schema = SCHEMAS[kind]
+        self.unit = unit
+        self.headers = [column.name for column in self.schema]
+        self._build = row_builder(kind, unit)
+        self._rows = []
+
+    def write(self, tool_data, tool_guid):
+        self._rows.append(self._build(tool_data, tool_guid))
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self.write_rows(self._rows)
+            self._rows = []
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TsvWriter(ToolWriter):
+    """Inventor CAM tool library TSV (version 14), what Inventor imports"""
+    extension = '.tsv'
+
+    def __init__(self, path, kind, unit='millimeters'):
+        super().__init__(path, kind, unit)
+        self._file = open(path, 'w', newline='', encoding='utf-8', buffering=1 << 20)
+        self._writer = csv.writer(self._file, delimiter='\t')
+        # Every Inventor TSV starts with a version header and the column names
+        self._writer.writerow(['version'])
+        self._writer.writerow(['14'])
+        self._writer.writerow(self.headers)
+
+    def write_rows(self, rows):
+        # As long as no field needs quoting, csv writes exactly the fields
+        # joined by tabs. Join the whole chunk, check it once by counting
+        # separators, and only hand it to csv if some field needs quoting.
+        try:
+            text = '\r\n'.join(['\t'.join(row) for row in rows]) + '\r\n'
+        except TypeError:  # a value that isn't a string
+            text = None
+        if text is not None and self._is_plain(text, len(rows)):
+            self._file.write(text)
+        else:
+            self._writer.writerows(rows)
+
+    def _is_plain(self, text, rows):
+        return ('"' not in text
+                and text.count('\t') == rows * (len(self.headers) - 1)
+                and text.count('\n') == rows
+                and text.count('\r') == rows)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._file.close()
+
+
+class JsonWriter(ToolWriter):
+    """JSON tool library: {"version": 14, "unit": ..., "data": [{column: value}]}
+
+    Keys are the same column names as the TSV; numeric columns are written
+    as JSON numbers. The file is written a chunk at a time, never held whole.
+    """
+    extension = '.json'
+
+    def __init__(self, path, kind, unit='millimeters'):
+        super().__init__(path, kind, unit)
+        self._numeric = [i for i, column in enumerate(self.schema) if column.numeric]
+        self._numbers = {}  # text -> to_number(text); the same few values repeat a lot
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+        self._file = open(path, 'w', encoding='utf-8', buffering=1 << 20)
+        self._file.write(f'{{"version": 14, "unit": {json.dumps(unit)}, "data": [')
+        self._first = True
+
+    def write_rows(self, rows):
+        headers = self.headers
+        numbers = self._numbers
+        encode = self._encode
+        parts = []
+        for row in rows:
+            row = list(row)
+            for i in self._numeric:
+                text = row[i]
+                value = numbers.get(text)
+                if value is None:
+                    if len(numbers) > 100000:
+                        numbers.clear()
+                    value = numbers[text] = to_number(text)
+                row[i] = value
+            parts.append(encode(dict(zip(headers, row))))
+        self._file.write(('\n' if self._first else ',\n') + ',\n'.join(parts))
+        self._first = False
+
+    def close(self):
+        try:
+            super().close()
+            self._file.write('\n]}\n')
+        finally:
+            self._file.close()
+
+
+class ParquetWriter(ToolWriter):
+    """Columnar Parquet file for analytics, one row group per chunk
+
+    Numeric columns are float64 (null where the .tlm held something that
+    isn't a number), the rest are strings. Needs pyarrow.
+    """
+    extension = '.parquet'
+    chunk_size = 65536
+
+    def __init__(self, path, kind, unit='millimeters'):
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from None
+        super().__init__(path, kind, unit)
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([
+            (column.name, pyarrow.float64() if column.numeric else pyarrow.string())
+            for column in self.schema
+        ], metadata={'version': '14', 'unit': unit})
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write_rows(self, rows):
+        pa = self._pa
+        arrays = []
+        for column, values in zip(self.schema, zip(*rows)):
+            values = pa.array(values, type=pa.string())
+            if column.numeric:
+                try:
+                    values = pa.compute.cast(values, pa.float64())
+                except pa.ArrowInvalid:  # some text that isn't a number
+                    values = pa.array([_to_float(value) for value in values.to_pylist()],
+                                      type=pa.float64())
+            arrays.append(values)
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._writer.close()
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# --format name -> writer class. A new output format is one more class here.
+WRITERS = {
+    'tsv': TsvWriter,
+    'json': JsonWriter,
+    'parquet': ParquetWriter,
+}
+
+
+def open_writer(fmt, path, kind, unit='millimeters'):
+    """Writer for the given format name; use it as a context manager"""
+    try:
+        writer_class = WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"format must be one of {', '.join(WRITERS)}, not {fmt!r}") from None
+    return writer_class(path, kind, unit)